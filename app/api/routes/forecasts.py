@@ -90,20 +90,20 @@ async def get_forecasts(
             format=format,
         )
 
-        forecasts = service.get_forecasts(query)
-
         if format == "ndjson":
+            count, stream = service.stream_forecasts(query)
 
             def generate():
-                for forecast in forecasts:
+                for forecast in stream:
                     yield json.dumps(forecast.model_dump()) + "\n"
 
             return StreamingResponse(
                 generate(),
                 media_type="application/x-ndjson",
-                headers={"X-Total-Count": str(len(forecasts))},
+                headers={"X-Total-Count": str(count)},
             )
         else:
+            forecasts = service.get_forecasts(query)
             return ForecastResponse(
                 data=forecasts, count=len(forecasts), query=query.model_dump(exclude_none=True)
             )
@@ -147,10 +147,7 @@ async def get_forecast_summary(
             metric_filters=metric_filters,
         )
 
-        forecasts = service.get_forecasts(query)
-        summary = service.get_forecast_summary(forecasts)
-
-        return summary
+        return service.get_summary(query)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple
 
 from app.models.forecast import GridCellForecast, MetricConstraint, MetricName
 
@@ -25,6 +25,16 @@ class ForecastRepository(Protocol):
     ) -> List[GridCellForecast]:
         """Return forecasts filtered by the provided criteria."""
 
+    def stream_forecasts(
+        self,
+        country: Optional[str] = None,
+        grid_ids: Optional[List[int]] = None,
+        months: Optional[List[str]] = None,
+        metrics: Optional[List[MetricName]] = None,
+        metric_constraints: Optional[List[MetricConstraint]] = None,
+    ) -> Tuple[int, Iterator[GridCellForecast]]:
+        """Return the number of matching forecasts and a lazy iterator over them."""
+
     def get_available_months(self) -> List[Dict[str, Any]]:
         """Return summary metadata for available forecast months."""
 
@@ -11,10 +11,15 @@ from app.services.sample_data import write_sample_forecasts
 PROMPT_TEMPLATE = "No parquet files found in {data_dir}. Generate a sample dataset now? [Y/n] "
 
 
-def ensure_local_data_ready(prompt_user: bool = False) -> Optional[Path]:
-    """Ensure the local data directory contains at least one parquet file."""
+def ensure_local_data_ready(
+    prompt_user: bool = False, data_dir: Optional[Path] = None
+) -> Optional[Path]:
+    """Ensure the local data directory contains at least one parquet file.
 
-    data_dir = Path(settings.data_path)
+    Defaults to ``settings.data_path`` when no directory is given.
+    """
+
+    data_dir = Path(data_dir or settings.data_path)
     data_dir.mkdir(parents=True, exist_ok=True)
 
     parquet_files = list(data_dir.glob("*.parquet"))
@@ -6,10 +6,13 @@ import logging
 import sqlite3
 import sys
 import tempfile
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pyarrow.parquet as pq
 from cachetools import TTLCache
 
@@ -20,7 +23,8 @@ except ModuleNotFoundError:  # pragma: no cover - boto3 optional for local workf
     boto3 = None
     BotoCoreError = ClientError = Exception
 
-from app.core.config import settings
+from app.core.config import Settings
+from app.core.config import settings as default_settings
 from app.domain.repositories import ForecastRepository
 from app.models.forecast import (
     ALL_METRIC_NAMES,
@@ -36,6 +40,22 @@ from app.services.sample_data import FORECAST_COLUMNS, generate_sample_forecasts
 
 logger = logging.getLogger(__name__)
 
+# Low-cardinality string columns stored as pandas categoricals once loaded.
+CATEGORICAL_COLUMNS = ("country_id", "month", "admin_1_id", "admin_2_id")
+# Loaded frames are sorted so each (country_id, month) pair is a contiguous block.
+SORT_COLUMNS = ("country_id", "month", "grid_id")
+# Number of rows converted to forecast models at a time when streaming.
+STREAM_BATCH_SIZE = 4096
+# Total number of forecast models held by the per-query result cache. Results
+# larger than this (e.g. unfiltered full-grid queries) are never cached.
+RESULT_CACHE_MAX_FORECASTS = 50_000
+# Confidence interval bounds that must satisfy low <= high.
+CI_BOUND_PAIRS = (
+    ("ci_50_low", "ci_50_high"),
+    ("ci_90_low", "ci_90_high"),
+    ("ci_99_low", "ci_99_high"),
+)
+
 
 class DataLoader(ForecastRepository):
     """Load forecast data from parquet, SQLite, or cloud storage."""
@@ -46,15 +66,27 @@ class DataLoader(ForecastRepository):
         data_path: Optional[str | Path] = None,
         backend: Optional[str] = None,
         database_url: Optional[str] = None,
+        settings: Optional[Settings] = None,
     ) -> None:
-        self.cache = TTLCache(maxsize=settings.cache_max_size, ttl=settings.cache_ttl_seconds)
-        self.data_path = Path(data_path or settings.data_path)
+        # Explicit settings let callers and tests configure a loader without
+        # patching the process-wide settings object.
+        self.settings = settings if settings is not None else default_settings
+        self.cache = TTLCache(
+            maxsize=self.settings.cache_max_size, ttl=self.settings.cache_ttl_seconds
+        )
+        self.result_cache = TTLCache(
+            maxsize=RESULT_CACHE_MAX_FORECASTS, ttl=self.settings.cache_ttl_seconds, getsizeof=len
+        )
+        self.data_path = Path(data_path or self.settings.data_path)
         self.data_path.mkdir(parents=True, exist_ok=True)
 
-        self.backend = (backend or settings.data_backend).lower()
-        self._database_url = database_url or settings.database_url
+        self.backend = (backend or self.settings.data_backend).lower()
+        self._database_url = database_url or self.settings.database_url
 
         self._data: Optional[pd.DataFrame] = None
+        self._data_signature: Optional[Tuple[Any, ...]] = None
+        self._slice_index: Optional[Dict[Tuple[str, str], Tuple[int, int]]] = None
+        self._indexed_frame: Optional[pd.DataFrame] = None
         self._s3_client = None
         self._db_path: Optional[Path] = None
 
@@ -63,10 +95,10 @@ class DataLoader(ForecastRepository):
                 "Falling back to sample data because USE_LOCAL_DATA is true or AWS credentials are missing."
             )
             self.backend = "parquet"
-            ensure_local_data_ready(prompt_user=False)
 
         if self.backend == "parquet":
-            self.data_path.mkdir(parents=True, exist_ok=True)
+            # Provision sample data once at startup rather than on the request path.
+            ensure_local_data_ready(prompt_user=False, data_dir=self.data_path)
         elif self.backend == "database":
             self._init_database()
         elif self.backend == "cloud":
@@ -83,10 +115,10 @@ class DataLoader(ForecastRepository):
         return False
 
     def _should_use_sample_backend(self) -> bool:
-        if settings.use_local_data:
+        if self.settings.use_local_data:
             return True
-        if self._is_blank(settings.aws_access_key_id) or self._is_blank(
-            settings.aws_secret_access_key
+        if self._is_blank(self.settings.aws_access_key_id) or self._is_blank(
+            self.settings.aws_secret_access_key
         ):
             return True
         return False
@@ -105,19 +137,45 @@ class DataLoader(ForecastRepository):
             raise ImportError(
                 "boto3 is required for cloud data loading but is not installed. Install dependencies with `make install`."
             )
-        if not settings.cloud_bucket_name:
+        if not self.settings.cloud_bucket_name:
             raise ValueError("CLOUD_BUCKET_NAME must be set when DATA_BACKEND=cloud")
 
         session = boto3.session.Session(
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.cloud_bucket_region,
+            aws_access_key_id=self.settings.aws_access_key_id,
+            aws_secret_access_key=self.settings.aws_secret_access_key,
+            region_name=self.settings.cloud_bucket_region,
         )
         self._s3_client = session.client("s3")
 
+    def _source_signature(self) -> Optional[Tuple[Any, ...]]:
+        """Describe the local source files so reloads only happen when they change.
+
+        Returns ``None`` for backends without a cheap local signature (cloud),
+        which keep using the TTL cache instead.
+        """
+        if self.backend == "parquet":
+            signature = []
+            for file in sorted(self.data_path.glob("*.parquet")):
+                stat = file.stat()
+                signature.append((file.name, stat.st_mtime_ns, stat.st_size))
+            return tuple(signature)
+
+        if self.backend == "database" and self._db_path is not None:
+            if not self._db_path.exists():
+                return (str(self._db_path), None, None)
+            stat = self._db_path.stat()
+            return (str(self._db_path), stat.st_mtime_ns, stat.st_size)
+
+        return None
+
     def _load_data(self) -> pd.DataFrame:
+        signature = self._source_signature()
         cache_key = f"all_data::{self.backend}::{self.data_path}"
-        if cache_key in self.cache:
+
+        if signature is not None:
+            if self._data is not None and signature == self._data_signature:
+                return self._data
+        elif cache_key in self.cache:
             return self.cache[cache_key]
 
         if self.backend == "parquet":
@@ -129,21 +187,133 @@ class DataLoader(ForecastRepository):
         else:  # pragma: no cover - defensive
             raise ValueError(f"Unsupported data backend: {self.backend}")
 
-        self.cache[cache_key] = df
+        df = self._drop_invalid_rows(df)
+        df = self._categorize_columns(df)
+        df = df.sort_values(list(SORT_COLUMNS), kind="stable").reset_index(drop=True)
+        # Cached query results refer to the previous dataset.
+        self.result_cache.clear()
+        if signature is not None:
+            self._data = df
+            self._data_signature = signature
+        else:
+            self.cache[cache_key] = df
+        return df
+
+    def _get_slice_index(self, df: pd.DataFrame) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """Map each (country_id, month) pair to its contiguous row range in ``df``.
+
+        The index is rebuilt whenever ``_load_data`` hands out a different frame.
+        """
+        if self._slice_index is None or self._indexed_frame is not df:
+            groups = df.groupby(["country_id", "month"], observed=True, sort=False).indices
+            self._slice_index = {
+                (str(country), str(month)): (int(positions[0]), int(positions[-1]) + 1)
+                for (country, month), positions in groups.items()
+            }
+            self._indexed_frame = df
+        return self._slice_index
+
+    def _slice_frame(
+        self,
+        df: pd.DataFrame,
+        country: Optional[str],
+        months: Optional[List[str]],
+    ) -> pd.DataFrame:
+        month_set = set(months) if months else None
+        ranges = sorted(
+            bounds
+            for (key_country, key_month), bounds in self._get_slice_index(df).items()
+            if (not country or key_country == country)
+            and (month_set is None or key_month in month_set)
+        )
+        if not ranges:
+            return df.iloc[0:0]
+        if len(ranges) == 1:
+            start, stop = ranges[0]
+            return df.iloc[start:stop]
+
+        positions = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        return df.take(positions)
+
+    @staticmethod
+    def _drop_invalid_rows(df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows that would not pass ``GridCellForecast`` validation.
+
+        Forecast models are built without per-row validation, so the constraints
+        of ``ForecastMetrics`` and the coordinate ranges are enforced here once.
+        """
+        valid = np.ones(len(df), dtype=bool)
+
+        for column, low, high in (("latitude", -90, 90), ("longitude", -180, 180)):
+            values = df[column].to_numpy(dtype=np.float64)
+            valid &= (values >= low) & (values <= high)
+
+        for name in ALL_METRIC_NAMES:
+            if name not in df.columns:
+                continue
+            values = df[name].to_numpy(dtype=np.float64)
+            # NaN compares False, so this also rejects missing and non-finite values.
+            valid &= np.isfinite(values) & (values >= 0)
+            if name.startswith("prob_"):
+                valid &= values <= 1
+
+        for low, high in CI_BOUND_PAIRS:
+            if low in df.columns and high in df.columns:
+                valid &= df[low].to_numpy(dtype=np.float64) <= df[high].to_numpy(dtype=np.float64)
+
+        invalid_count = int(len(df) - valid.sum())
+        if invalid_count:
+            logger.warning("Dropping %d forecast rows with invalid values", invalid_count)
+            df = df[valid].reset_index(drop=True)
+        return df
+
+    @staticmethod
+    def _categorize_columns(df: pd.DataFrame) -> pd.DataFrame:
+        for column in CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype("category")
         return df
 
+    @staticmethod
+    def _optional_column(df: pd.DataFrame, column: str) -> List[Any]:
+        if column in df.columns:
+            return df[column].tolist()
+        return [None] * len(df)
+
+    @staticmethod
+    def _optional_str(value: Any) -> Optional[str]:
+        if value is None or pd.isna(value):
+            return None
+        return str(value)
+
     def _load_local_data(self) -> pd.DataFrame:
         parquet_files = list(self.data_path.glob("*.parquet"))
 
         if not parquet_files:
-            logger.warning("No parquet files found in %s", self.data_path)
-            ensure_local_data_ready(prompt_user=False)
-            parquet_files = list(self.data_path.glob("*.parquet"))
-
-        if not parquet_files:
-            logger.error("Unable to locate parquet files; returning generated sample data.")
+            logger.error(
+                "No parquet files found in %s; returning generated sample data. "
+                "Run `python scripts/bootstrap_local_data.py` to persist a sample dataset.",
+                self.data_path,
+            )
             return self._create_sample_data()
 
+        try:
+            dataset = pq.ParquetDataset([str(file) for file in sorted(parquet_files)])
+            table = dataset.read(use_threads=True)
+            df: Optional[pd.DataFrame] = table.to_pandas(self_destruct=True, split_blocks=True)
+        except (pa.ArrowException, OSError) as exc:
+            # Files with diverging schemas cannot be unified into one dataset scan.
+            logger.warning("Falling back to per-file parquet reads: %s", exc)
+            df = self._read_parquet_files(parquet_files)
+
+        if df is not None:
+            if not df.empty:
+                return df
+            logger.warning("Parquet files contained no rows; falling back to generated sample data")
+        return self._create_sample_data()
+
+    @staticmethod
+    def _read_parquet_files(parquet_files: List[Path]) -> Optional[pd.DataFrame]:
         frames: List[pd.DataFrame] = []
         for file in parquet_files:
             try:
@@ -151,12 +321,9 @@ class DataLoader(ForecastRepository):
             except Exception as exc:  # pragma: no cover - defensive
                 logger.error("Error loading %s: %s", file, exc)
 
-        if frames:
-            df = pd.concat(frames, ignore_index=True)
-            if not df.empty:
-                return df
-            logger.warning("Parquet files contained no rows; falling back to generated sample data")
-        return self._create_sample_data()
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
 
     def _load_database_data(self) -> pd.DataFrame:
         if not self._db_path:
@@ -197,10 +364,12 @@ class DataLoader(ForecastRepository):
         return df
 
     def _resolve_object_keys(self, bucket: str) -> List[str]:
-        if settings.cloud_data_key:
-            return [settings.cloud_data_key]
+        if self.settings.cloud_data_key:
+            return [self.settings.cloud_data_key]
 
-        prefix = settings.cloud_data_prefix.strip("/") if settings.cloud_data_prefix else ""
+        prefix = (
+            self.settings.cloud_data_prefix.strip("/") if self.settings.cloud_data_prefix else ""
+        )
         if prefix and not prefix.endswith("/"):
             prefix = f"{prefix}/"
 
@@ -268,14 +437,14 @@ class DataLoader(ForecastRepository):
             logger.error("S3 client is not initialized; returning generated sample data")
             return self._create_sample_data()
 
-        bucket = settings.cloud_bucket_name
+        bucket = self.settings.cloud_bucket_name
         object_keys = self._resolve_object_keys(bucket)
 
         if not object_keys:
             logger.warning(
                 "No parquet objects found in bucket %s with prefix '%s'",
                 bucket,
-                settings.cloud_data_prefix,
+                self.settings.cloud_data_prefix,
             )
             return self._create_sample_data()
 
@@ -345,30 +514,31 @@ class DataLoader(ForecastRepository):
         return self._create_sample_data()
 
     def _create_sample_data(self) -> pd.DataFrame:
-        df = generate_sample_forecasts()
-        sample_file = self.data_path / "sample_data.parquet"
-        df.to_parquet(sample_file, index=False)
-        logger.info("Sample data saved to %s", sample_file)
-        return df
+        # Kept in memory only; scripts/bootstrap_local_data.py persists sample data.
+        return generate_sample_forecasts()
 
-    def get_forecasts(
+    def get_forecast_frame(
         self,
         country: Optional[str] = None,
         grid_ids: Optional[List[int]] = None,
         months: Optional[List[str]] = None,
-        metrics: Optional[List[MetricName]] = None,
         metric_constraints: Optional[List[MetricConstraint]] = None,
-    ) -> List[GridCellForecast]:
-        df = self._load_data()
+    ) -> pd.DataFrame:
+        return self._filter_frame(self._load_data(), country, grid_ids, months, metric_constraints)
 
-        if country:
-            df = df[df["country_id"] == country]
+    def _filter_frame(
+        self,
+        df: pd.DataFrame,
+        country: Optional[str],
+        grid_ids: Optional[List[int]],
+        months: Optional[List[str]],
+        metric_constraints: Optional[List[MetricConstraint]],
+    ) -> pd.DataFrame:
+        if country or months:
+            df = self._slice_frame(df, country, months)
 
         if grid_ids:
-            df = df[df["grid_id"].isin(grid_ids)]
-
-        if months:
-            df = df[df["month"].isin(months)]
+            df = df[np.isin(df["grid_id"].to_numpy(), grid_ids)]
 
         if metric_constraints:
             for constraint in metric_constraints:
@@ -385,22 +555,102 @@ class DataLoader(ForecastRepository):
                 elif constraint.operator is ComparisonOperator.lte:
                     df = df[df[column] <= constraint.value]
 
+        return df
+
+    def get_forecasts(
+        self,
+        country: Optional[str] = None,
+        grid_ids: Optional[List[int]] = None,
+        months: Optional[List[str]] = None,
+        metrics: Optional[List[MetricName]] = None,
+        metric_constraints: Optional[List[MetricConstraint]] = None,
+    ) -> List[GridCellForecast]:
+        # Refresh the dataset first so a reload clears stale cached results.
+        df = self._load_data()
+
+        cache_key = (
+            country,
+            tuple(sorted(grid_ids or ())),
+            tuple(sorted(months or ())),
+            tuple(sorted(metric.value for metric in metrics or ())),
+            tuple(
+                (constraint.metric.value, constraint.operator.value, constraint.value)
+                for constraint in metric_constraints or ()
+            ),
+        )
+        if cache_key in self.result_cache:
+            # Callers share the cached list and must not mutate it.
+            return self.result_cache[cache_key]
+
+        df = self._filter_frame(df, country, grid_ids, months, metric_constraints)
+        forecasts = list(self._iter_forecast_batches(df, self._metric_columns(df, metrics)))
+        if len(forecasts) <= self.result_cache.maxsize:
+            self.result_cache[cache_key] = forecasts
+        return forecasts
+
+    def stream_forecasts(
+        self,
+        country: Optional[str] = None,
+        grid_ids: Optional[List[int]] = None,
+        months: Optional[List[str]] = None,
+        metrics: Optional[List[MetricName]] = None,
+        metric_constraints: Optional[List[MetricConstraint]] = None,
+    ) -> Tuple[int, Iterator[GridCellForecast]]:
+        df = self.get_forecast_frame(
+            country=country,
+            grid_ids=grid_ids,
+            months=months,
+            metric_constraints=metric_constraints,
+        )
+
+        return len(df), self._iter_forecast_batches(df, self._metric_columns(df, metrics))
+
+    @staticmethod
+    def _metric_columns(df: pd.DataFrame, metrics: Optional[List[MetricName]]) -> List[str]:
         selected_metrics = [metric.value for metric in metrics] if metrics else ALL_METRIC_NAMES
+        return [name for name in selected_metrics if name in df.columns]
+
+    def _iter_forecast_batches(
+        self, df: pd.DataFrame, metric_columns: List[str]
+    ) -> Iterator[GridCellForecast]:
+        # Models are built one batch at a time so streaming callers hold at most
+        # STREAM_BATCH_SIZE of them in memory.
+        for start in range(0, len(df), STREAM_BATCH_SIZE):
+            yield from self._build_forecasts(
+                df.iloc[start : start + STREAM_BATCH_SIZE], metric_columns
+            )
 
+    def _build_forecasts(
+        self, df: pd.DataFrame, metric_columns: List[str]
+    ) -> List[GridCellForecast]:
+        metric_values = [df[name].tolist() for name in metric_columns]
+        # zip() yields each row's metric values as a tuple without per-row indexing.
+        metric_rows = zip(*metric_values) if metric_values else repeat((), len(df))
+
+        rows = zip(
+            df["grid_id"].tolist(),
+            df["latitude"].tolist(),
+            df["longitude"].tolist(),
+            df["country_id"].tolist(),
+            df["month"].tolist(),
+            self._optional_column(df, "admin_1_id"),
+            self._optional_column(df, "admin_2_id"),
+            metric_rows,
+        )
+
+        # Rows are checked once by _drop_invalid_rows, so skip per-row model validation.
         forecasts: List[GridCellForecast] = []
-        for _, row in df.iterrows():
-            record = row.to_dict()
-            metrics_data = {name: record[name] for name in selected_metrics if name in record}
+        for grid_id, latitude, longitude, country_id, month, admin_1, admin_2, values in rows:
             forecasts.append(
-                GridCellForecast(
-                    grid_id=int(record["grid_id"]),
-                    latitude=float(record["latitude"]),
-                    longitude=float(record["longitude"]),
-                    country_id=str(record["country_id"]),
-                    admin_1_id=record.get("admin_1_id"),
-                    admin_2_id=record.get("admin_2_id"),
-                    month=record["month"],
-                    metrics=ForecastMetrics(**metrics_data),
+                GridCellForecast.model_construct(
+                    grid_id=int(grid_id),
+                    latitude=float(latitude),
+                    longitude=float(longitude),
+                    country_id=str(country_id),
+                    admin_1_id=self._optional_str(admin_1),
+                    admin_2_id=self._optional_str(admin_2),
+                    month=str(month),
+                    metrics=ForecastMetrics.model_construct(**dict(zip(metric_columns, values))),
                 )
             )
 
@@ -414,9 +664,9 @@ class DataLoader(ForecastRepository):
             month_df = df[df["month"] == month]
             months_data.append(
                 {
-                    "month": month,
+                    "month": str(month),
                     "forecast_count": len(month_df),
-                    "countries": month_df["country_id"].unique().tolist(),
+                    "countries": [str(country) for country in month_df["country_id"].unique()],
                 }
             )
 
@@ -426,22 +676,33 @@ class DataLoader(ForecastRepository):
         df = self._load_data()
 
         if country:
-            df = df[df["country_id"] == country]
+            df = self._slice_frame(df, country, None)
+
+        key_columns = ["grid_id", "latitude", "longitude", "country_id"]
+        admin_columns = [column for column in ("admin_1_id", "admin_2_id") if column in df.columns]
+
+        table = pa.Table.from_pandas(df[key_columns + admin_columns], preserve_index=False)
+        for index, field in enumerate(table.schema):
+            # Arrow's hash "first" and sort kernels do not accept dictionary columns.
+            if pa.types.is_dictionary(field.type):
+                table = table.set_column(index, field.name, table[field.name].cast(pa.string()))
 
         grouped = (
-            df.groupby(["grid_id", "latitude", "longitude", "country_id"]).first().reset_index()
+            table.group_by(key_columns, use_threads=False)
+            .aggregate([(column, "first") for column in admin_columns])
+            .sort_by([(column, "ascending") for column in key_columns])
         )
 
         cells: List[Dict[str, Any]] = []
-        for _, row in grouped.iterrows():
+        for row in grouped.to_pylist():
             cells.append(
                 {
                     "grid_id": int(row["grid_id"]),
                     "latitude": float(row["latitude"]),
                     "longitude": float(row["longitude"]),
                     "country_id": str(row["country_id"]),
-                    "admin_1_id": row.get("admin_1_id"),
-                    "admin_2_id": row.get("admin_2_id"),
+                    "admin_1_id": row.get("admin_1_id_first"),
+                    "admin_2_id": row.get("admin_2_id_first"),
                 }
             )
 
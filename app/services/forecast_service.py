@@ -2,14 +2,39 @@
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple, runtime_checkable
+
+import pandas as pd
 
 from app.domain.repositories import ForecastRepository
-from app.models.forecast import ForecastQuery, GridCellForecast, MetricName
+from app.models.forecast import (
+    ForecastQuery,
+    GridCellForecast,
+    MetricConstraint,
+    MetricName,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@runtime_checkable
+class ForecastFrameSource(Protocol):
+    """Repository that can return filtered forecast rows as a DataFrame.
+
+    Kept out of ``ForecastRepository`` so repositories are not required to
+    use pandas; ``ForecastService.get_summary`` uses it when available.
+    """
+
+    def get_forecast_frame(
+        self,
+        country: Optional[str] = None,
+        grid_ids: Optional[List[int]] = None,
+        months: Optional[List[str]] = None,
+        metric_constraints: Optional[List[MetricConstraint]] = None,
+    ) -> pd.DataFrame:
+        """Return the filtered forecast rows as a DataFrame without building models."""
+
+
 class ForecastService:
     """Business logic for querying forecasts."""
 
@@ -22,25 +47,20 @@ class ForecastService:
         if len(parts) != 2:
             raise ValueError("Invalid month range format")
 
-        start_date = datetime.strptime(f"{parts[0]}-01", "%Y-%m-%d")
-        end_date = datetime.strptime(f"{parts[1]}-01", "%Y-%m-%d")
+        try:
+            start, end = (
+                pd.Period(datetime.strptime(f"{part}-01", "%Y-%m-%d"), freq="M") for part in parts
+            )
+        except ValueError as exc:
+            raise ValueError("Invalid month range format") from exc
 
-        if start_date > end_date:
+        if start > end:
             raise ValueError("Start month must be before end month")
 
-        months: List[str] = []
-        current = start_date
-        while current <= end_date:
-            months.append(current.strftime("%Y-%m"))
-            if current.month == 12:
-                current = current.replace(year=current.year + 1, month=1)
-            else:
-                current = current.replace(month=current.month + 1)
+        return pd.period_range(start=start, end=end, freq="M").strftime("%Y-%m").tolist()
 
-        return months
-
-    def get_forecasts(self, query: ForecastQuery) -> List[GridCellForecast]:
-        """Get forecasts based on query parameters."""
+    def _resolve_months(self, query: ForecastQuery) -> Optional[List[str]]:
+        """Merge explicit months with any month range on the query."""
         months_filter = query.months
 
         if query.month_range:
@@ -50,6 +70,10 @@ class ForecastService:
             else:
                 months_filter = range_months
 
+        return months_filter
+
+    def _repository_filters(self, query: ForecastQuery) -> Dict[str, Any]:
+        """Translate a query into keyword filters for the repository."""
         metrics_filter = None
         if query.metrics:
             metrics_filter = [
@@ -62,27 +86,79 @@ class ForecastService:
         except ValueError as exc:
             raise ValueError(str(exc)) from exc
 
-        forecasts = self.repository.get_forecasts(
+        return {
+            "country": query.country,
+            "grid_ids": query.grid_ids,
+            "months": self._resolve_months(query),
+            "metrics": metrics_filter,
+            "metric_constraints": metric_constraints,
+        }
+
+    def get_forecasts(self, query: ForecastQuery) -> List[GridCellForecast]:
+        """Get forecasts based on query parameters."""
+        forecasts = self.repository.get_forecasts(**self._repository_filters(query))
+
+        logger.info("Retrieved %d forecasts", len(forecasts))
+        return forecasts
+
+    def stream_forecasts(self, query: ForecastQuery) -> Tuple[int, Iterator[GridCellForecast]]:
+        """Get the forecast count and a lazy iterator over matching forecasts."""
+        count, forecasts = self.repository.stream_forecasts(**self._repository_filters(query))
+
+        logger.info("Streaming %d forecasts", count)
+        return count, forecasts
+
+    def get_summary(self, query: ForecastQuery) -> Dict[str, Any]:
+        """Get summary statistics for a query, without building models when possible."""
+        if not isinstance(self.repository, ForecastFrameSource):
+            return self.get_forecast_summary(self.get_forecasts(query))
+
+        metric_constraints = query.parse_metric_filters()
+
+        df = self.repository.get_forecast_frame(
             country=query.country,
             grid_ids=query.grid_ids,
-            months=months_filter,
-            metrics=metrics_filter,
+            months=self._resolve_months(query),
             metric_constraints=metric_constraints,
         )
+        return self.get_forecast_summary_from_frame(df)
 
-        logger.info("Retrieved %d forecasts", len(forecasts))
-        return forecasts
+    @staticmethod
+    def _empty_summary() -> Dict[str, Any]:
+        return {
+            "count": 0,
+            "countries": [],
+            "months": [],
+            "grid_cells": 0,
+            "metrics_summary": {"avg_map": 0.0, "min_map": None, "max_map": None},
+        }
+
+    def get_forecast_summary_from_frame(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Generate summary statistics directly from a forecast DataFrame."""
+        if df.empty:
+            return self._empty_summary()
+
+        map_stats = df["map"].agg(["sum", "min", "max"])
+        avg_map = float(map_stats["sum"]) / len(df)
+        min_map = map_stats["min"]
+        max_map = map_stats["max"]
+
+        return {
+            "count": len(df),
+            "countries": sorted(str(value) for value in df["country_id"].unique()),
+            "months": sorted(str(value) for value in df["month"].unique()),
+            "grid_cells": int(df["grid_id"].nunique()),
+            "metrics_summary": {
+                "avg_map": round(avg_map, 2),
+                "min_map": round(float(min_map), 2) if pd.notna(min_map) else 0,
+                "max_map": round(float(max_map), 2) if pd.notna(max_map) else 0,
+            },
+        }
 
     def get_forecast_summary(self, forecasts: List[GridCellForecast]) -> Dict[str, Any]:
-        """Generate summary statistics for forecasts."""
+        """Generate summary statistics for already materialized forecasts."""
         if not forecasts:
-            return {
-                "count": 0,
-                "countries": [],
-                "months": [],
-                "grid_cells": 0,
-                "metrics_summary": {"avg_map": 0.0, "min_map": None, "max_map": None},
-            }
+            return self._empty_summary()
 
         countries = set()
         months = set()
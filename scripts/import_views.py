@@ -4,12 +4,18 @@
 from __future__ import annotations
 
 import argparse
+import csv
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -37,6 +43,53 @@ FORECAST_COLUMNS: List[str] = [
     "prob_10000",
 ]
 
+# Dtypes for forecast columns a drop does not provide, mirroring FORECAST_SCHEMA
+# with nullable types; metrics are kept as float64 until the database load.
+DEFAULT_DTYPES: Dict[str, str] = {col: "float64" for col in FORECAST_COLUMNS} | {
+    "grid_id": "Int64",
+    "country_id": "string",
+    "admin_1_id": "string",
+    "admin_2_id": "string",
+    "month": "string",
+}
+
+PRIOGRID_LOOKUP_COLUMNS = (
+    "pg_id",
+    "gid",
+    "grid_id",
+    "lat",
+    "Latitude",
+    "latitude",
+    "lon",
+    "Longitude",
+    "longitude",
+    "iso3",
+    "country",
+    "country_id",
+    "admin_1_id",
+    "admin_2_id",
+)
+CENTROID_COLUMNS = ("iso3", "country_id", "lat", "latitude", "lon", "longitude")
+# Identifier columns are read as strings so zero-padded codes such as "074" survive.
+STRING_COLUMNS = ("iso3", "country", "country_id", "isoab", "admin_1_id", "admin_2_id")
+# Low-cardinality string columns written as dictionary-encoded parquet columns.
+CATEGORICAL_COLUMNS = ("country_id", "month", "admin_1_id", "admin_2_id")
+PARQUET_ROW_GROUP_SIZE = 200_000
+PARQUET_DATA_PAGE_SIZE = 1 << 20
+# Multiples of the MAP used for credible intervals the drop does not provide.
+CI_FALLBACK_FACTORS = {
+    "ci_50_low": 0.75,
+    "ci_50_high": 1.25,
+    "ci_90_low": 0.5,
+    "ci_90_high": 1.5,
+    "ci_99_low": 0.25,
+    "ci_99_high": 2.0,
+}
+PGM_CSV_COLUMNS = ("pg_id", "month_id", "main_mean", "main_dich", *FORECAST_COLUMNS)
+CM_CSV_COLUMNS = ("isoab", "year", "month_id", "main_mean", "main_dich", *FORECAST_COLUMNS)
+# Schema metadata key describing the CSV a parquet cache was built from.
+CSV_CACHE_METADATA_KEY = b"import_views.csv_source"
+
 
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments for the import script.
@@ -89,6 +142,81 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def read_csv_columns(path: Path, columns: Iterable[str]) -> pd.DataFrame:
+    """Read only the listed columns that are present in a CSV file.
+
+    Uses the multithreaded PyArrow CSV reader so unused columns are never
+    decoded.
+
+    Args:
+        path: Path to the CSV file.
+        columns: Candidate column names to keep.
+
+    Returns:
+        DataFrame with the subset of ``columns`` found in the file header.
+    """
+    return _read_csv_table(path, columns).to_pandas()
+
+
+def _read_csv_table(path: Path, columns: Iterable[str]) -> pa.Table:
+    # utf-8-sig strips the byte order mark Excel exports put before the header.
+    with path.open("r", encoding="utf-8-sig", newline="") as fh:
+        header = next(csv.reader(fh), [])
+
+    wanted = set(columns)
+    include_columns = [name for name in header if name in wanted]
+    return pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(
+            include_columns=include_columns,
+            column_types={name: pa.string() for name in STRING_COLUMNS},
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def read_csv_cached(path: Path, columns: Iterable[str]) -> pa.Table:
+    """Read a CSV through a parquet cache stored next to it.
+
+    The cache (``<name>.cache.parquet``) records the CSV's size, mtime and the
+    requested columns in its schema metadata, and is reused only while all
+    three match, so repeated imports skip CSV parsing entirely.
+
+    Args:
+        path: Path to the CSV file.
+        columns: Candidate column names to keep.
+
+    Returns:
+        Arrow table with the subset of ``columns`` found in the file header.
+    """
+    columns = list(columns)
+    stat = path.stat()
+    source = json.dumps(
+        {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "columns": columns}
+    ).encode("utf-8")
+
+    cache_path = path.with_suffix(".cache.parquet")
+    if cache_path.exists():
+        try:
+            metadata = pq.read_schema(cache_path).metadata or {}
+        except (pa.ArrowException, OSError) as exc:
+            logger.warning("Ignoring unreadable CSV cache %s: %s", cache_path, exc)
+            metadata = {}
+        if metadata.get(CSV_CACHE_METADATA_KEY) == source:
+            logger.info("Using cached parquet %s", cache_path)
+            return pq.read_table(cache_path)
+
+    table = _read_csv_table(path, columns)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), CSV_CACHE_METADATA_KEY: source}
+    )
+    try:
+        pq.write_table(table, cache_path, compression="zstd")
+    except OSError as exc:
+        logger.warning("Unable to write CSV cache %s: %s", cache_path, exc)
+    return table
+
+
 def build_month_lookup(codebook_path: Path) -> Dict[int, str]:
     """Build month ID to name mapping from VIEWS codebook.
 
@@ -126,6 +254,42 @@ def build_month_lookup(codebook_path: Path) -> Dict[int, str]:
     return lookup
 
 
+def month_lookup_array(month_lookup: Dict[int, str]) -> np.ndarray:
+    """Build an array indexed by month id holding month names (None if unknown).
+
+    Args:
+        month_lookup: Dictionary mapping month IDs to YYYY-MM strings.
+
+    Returns:
+        Object array of length ``max(month_id) + 1``.
+    """
+    names = np.full(max(month_lookup, default=-1) + 1, None, dtype=object)
+    names[list(month_lookup)] = list(month_lookup.values())
+    return names
+
+
+def lookup_month_names(
+    month_ids: pd.Series, month_lookup: Dict[int, str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Map month ids to names with a NumPy gather instead of a per-row dict lookup.
+
+    Args:
+        month_ids: Series of VIEWS month ids.
+        month_lookup: Dictionary mapping month IDs to YYYY-MM strings.
+
+    Returns:
+        Tuple of the month names (None where unknown) and a boolean mask of
+        ids missing from the codebook.
+    """
+    names_by_id = month_lookup_array(month_lookup)
+    ids = month_ids.to_numpy(dtype=np.float64)
+    in_range = (ids >= 0) & (ids < len(names_by_id))
+
+    names = np.full(len(ids), None, dtype=object)
+    names[in_range] = names_by_id[ids[in_range].astype(np.int64)]
+    return names, pd.isna(names)
+
+
 def load_priogrid_lookup(path: Optional[Path]) -> Optional[pd.DataFrame]:
     """Load PRIO-GRID metadata lookup table.
 
@@ -133,8 +297,8 @@ def load_priogrid_lookup(path: Optional[Path]) -> Optional[pd.DataFrame]:
         path: Optional path to CSV with PRIO-GRID metadata.
 
     Returns:
-        DataFrame with grid_id, latitude, longitude, country_id columns,
-        or None if no path provided.
+        DataFrame indexed by grid_id with latitude, longitude, country_id
+        columns, or None if no path provided.
 
     Raises:
         FileNotFoundError: If lookup file doesn't exist.
@@ -146,7 +310,7 @@ def load_priogrid_lookup(path: Optional[Path]) -> Optional[pd.DataFrame]:
     if not path.exists():
         raise FileNotFoundError(f"PRIO-GRID lookup not found at {path}")
 
-    df = pd.read_csv(path)
+    df = read_csv_columns(path, PRIOGRID_LOOKUP_COLUMNS)
 
     rename_map = {}
     if "pg_id" in df.columns:
@@ -183,7 +347,8 @@ def load_priogrid_lookup(path: Optional[Path]) -> Optional[pd.DataFrame]:
         if optional in df.columns:
             subset_cols.append(optional)
 
-    df = df[subset_cols].drop_duplicates("grid_id")
+    # Index once on grid_id so conversions can gather rows with reindex.
+    df = df[subset_cols].drop_duplicates("grid_id").set_index("grid_id")
     logger.info("Loaded %d PRIO-GRID rows", len(df))
     return df
 
@@ -195,7 +360,7 @@ def load_country_centroids(path: Optional[Path]) -> Optional[pd.DataFrame]:
         path: Optional path to CSV with country centroids.
 
     Returns:
-        DataFrame with country_id, latitude, longitude columns,
+        DataFrame indexed by country_id with latitude, longitude columns,
         or None if no path provided.
 
     Raises:
@@ -207,7 +372,7 @@ def load_country_centroids(path: Optional[Path]) -> Optional[pd.DataFrame]:
     if not path.exists():
         raise FileNotFoundError(f"Country centroids not found at {path}")
 
-    df = pd.read_csv(path)
+    df = read_csv_columns(path, CENTROID_COLUMNS)
     rename_map = {}
     if "iso3" in df.columns:
         rename_map["iso3"] = "country_id"
@@ -223,71 +388,117 @@ def load_country_centroids(path: Optional[Path]) -> Optional[pd.DataFrame]:
         raise ValueError(
             f"Country centroids CSV must include {sorted(required)}; missing {sorted(missing)}"
         )
-    return df[["country_id", "latitude", "longitude"]]
+    # Index once on country_id so conversions can gather rows with reindex.
+    return (
+        df[["country_id", "latitude", "longitude"]]
+        .drop_duplicates("country_id")
+        .set_index("country_id")
+    )
+
 
+def _fill_missing(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Replace nulls and NaNs in a float column with zero."""
+    return pc.fill_null(pc.if_else(pc.is_nan(values), 0.0, values), 0.0)
 
-def ensure_metric_columns(df: pd.DataFrame) -> pd.DataFrame:
+
+def coerce_metrics_arrow(table: pa.Table) -> pa.Table:
     """Ensure all required metric columns exist with valid values.
 
     Fills missing metric columns with appropriate defaults and ensures
-    values are within expected ranges.
+    values are within expected ranges, using Arrow compute kernels so the
+    table is converted to pandas only once afterwards.
 
     Args:
-        df: Input DataFrame with partial metrics.
+        table: Input table with at least ``map`` and ``prob_1`` columns.
 
     Returns:
-        DataFrame with all required metric columns populated.
+        Table with all required metric columns populated as float64.
     """
-    df = df.copy()
-    df["map"] = df["map"].fillna(0)
-    df["prob_1"] = df["prob_1"].clip(lower=0, upper=1).fillna(0)
 
-    if "prob_0" not in df.columns:
-        df["prob_0"] = (1 - df["prob_1"]).clip(lower=0, upper=1)
+    def set_column(name: str, values: pa.ChunkedArray) -> None:
+        nonlocal table
+        index = table.schema.get_field_index(name)
+        if index == -1:
+            table = table.append_column(name, values)
+        else:
+            table = table.set_column(index, name, values)
+
+    map_values = _fill_missing(pc.cast(table["map"], pa.float64()))
+    prob_1 = _fill_missing(pc.cast(table["prob_1"], pa.float64()))
+    prob_1 = pc.min_element_wise(pc.max_element_wise(prob_1, 0.0), 1.0)
+    set_column("map", map_values)
+    set_column("prob_1", prob_1)
+
+    if "prob_0" not in table.column_names:
+        set_column("prob_0", pc.max_element_wise(pc.subtract(1.0, prob_1), 0.0))
 
     for col in ("prob_10", "prob_100", "prob_1000", "prob_10000"):
-        if col not in df.columns:
-            df[col] = 0.0
-
-    if "ci_50_low" not in df.columns:
-        df["ci_50_low"] = df["map"] * 0.75
-    if "ci_50_high" not in df.columns:
-        df["ci_50_high"] = df["map"] * 1.25
-    if "ci_90_low" not in df.columns:
-        df["ci_90_low"] = df["map"] * 0.5
-    if "ci_90_high" not in df.columns:
-        df["ci_90_high"] = df["map"] * 1.5
-    if "ci_99_low" not in df.columns:
-        df["ci_99_low"] = df["map"] * 0.25
-    if "ci_99_high" not in df.columns:
-        df["ci_99_high"] = df["map"] * 2.0
-
-    for col in (
-        "ci_50_low",
-        "ci_50_high",
-        "ci_90_low",
-        "ci_90_high",
-        "ci_99_low",
-        "ci_99_high",
-    ):
-        df[col] = df[col].fillna(0).clip(lower=0)
+        if col not in table.column_names:
+            set_column(col, pa.chunked_array([np.zeros(table.num_rows)]))
 
-    return df
+    for col, factor in CI_FALLBACK_FACTORS.items():
+        if col in table.column_names:
+            values = _fill_missing(pc.cast(table[col], pa.float64()))
+        else:
+            values = pc.multiply(map_values, factor)
+        set_column(col, pc.max_element_wise(values, 0.0))
+
+    return table
 
 
 def reorder_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Reorder columns to match expected API schema.
 
+    The result is assembled from the existing columns without copying them;
+    absent columns are added as typed all-null columns.
+
     Args:
         df: DataFrame with columns in any order.
 
     Returns:
         DataFrame with columns reordered to match FORECAST_COLUMNS.
     """
-    for col in FORECAST_COLUMNS:
-        if col not in df.columns:
-            df[col] = None
-    return df[FORECAST_COLUMNS]
+    columns = {
+        col: (
+            df[col]
+            if col in df.columns
+            else pd.Series(pd.NA, index=df.index, dtype=DEFAULT_DTYPES[col])
+        )
+        for col in FORECAST_COLUMNS
+    }
+    return pd.DataFrame(columns, copy=False)
+
+
+def _missing_coordinates(df: pd.DataFrame) -> np.ndarray:
+    """Return a boolean mask of rows lacking latitude or longitude."""
+    return np.isnan(df["latitude"].to_numpy(dtype=np.float64)) | np.isnan(
+        df["longitude"].to_numpy(dtype=np.float64)
+    )
+
+
+def write_forecast_parquet(df: pd.DataFrame, output_path: Path) -> None:
+    """Write a forecast frame as a compact, dictionary-encoded parquet file.
+
+    Args:
+        df: DataFrame with columns ordered as FORECAST_COLUMNS.
+        output_path: Path where the parquet file will be written.
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(
+        output_path,
+        index=False,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+        row_group_size=PARQUET_ROW_GROUP_SIZE,
+        data_page_size=PARQUET_DATA_PAGE_SIZE,
+    )
+    logger.info("Wrote %s (%d rows)", output_path, len(df))
 
 
 def convert_priogrid(
@@ -303,7 +514,7 @@ def convert_priogrid(
         csv_path: Path to input PRIO-GRID CSV file.
         output_path: Path where parquet file will be written.
         month_lookup: Dictionary mapping month IDs to YYYY-MM strings.
-        priogrid_lookup: DataFrame with grid metadata.
+        priogrid_lookup: DataFrame with grid metadata indexed by grid_id.
         overwrite: Whether to overwrite existing output file.
 
     Returns:
@@ -317,40 +528,42 @@ def convert_priogrid(
         raise FileExistsError(f"{output_path} already exists. Use --overwrite to replace it.")
 
     logger.info("Processing PRIO-GRID file %s", csv_path)
-    df = pd.read_csv(csv_path)
-    if df.empty:
+    table = read_csv_cached(csv_path, PGM_CSV_COLUMNS)
+    if table.num_rows == 0:
         raise ValueError(f"Input file {csv_path} has no rows")
 
-    df = df.rename(
-        columns={
-            "pg_id": "grid_id",
-            "main_mean": "map",
-            "main_dich": "prob_1",
-        }
-    )
+    renames = {
+        "pg_id": "grid_id",
+        "main_mean": "map",
+        "main_dich": "prob_1",
+    }
+    table = table.rename_columns([renames.get(name, name) for name in table.column_names])
     required = {"grid_id", "month_id", "map", "prob_1"}
-    missing = required - set(df.columns)
+    missing = required - set(table.column_names)
     if missing:
         raise ValueError(f"Missing expected columns in {csv_path}: {sorted(missing)}")
 
-    df["month"] = df["month_id"].map(month_lookup)
-    if df["month"].isna().any():
-        bad_ids = df.loc[df["month"].isna(), "month_id"].unique()
+    # Split blocks so pandas adopts each Arrow column without consolidating copies.
+    df = coerce_metrics_arrow(table).to_pandas(self_destruct=True, split_blocks=True)
+
+    df["month"], unknown_months = lookup_month_names(df["month_id"], month_lookup)
+    if unknown_months.any():
+        bad_ids = df.loc[unknown_months, "month_id"].unique()
         raise ValueError(f"Month IDs {bad_ids} not found in codebook")
 
-    df = df.merge(priogrid_lookup, on="grid_id", how="left")
-    if df[["latitude", "longitude"]].isna().any().any():
-        missing = df.loc[df["latitude"].isna(), "grid_id"].unique()
+    matched = priogrid_lookup.reindex(df["grid_id"].to_numpy())
+    for col in matched.columns:
+        df[col] = matched[col].to_numpy()
+    missing_mask = _missing_coordinates(df)
+    if missing_mask.any():
+        missing = df.loc[missing_mask, "grid_id"].unique()
         raise ValueError(
             f"Latitude/longitude missing for {len(missing)} grid cells. Check the PRIO-GRID lookup."
         )
 
-    df = ensure_metric_columns(df)
     df = reorder_columns(df)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(output_path, index=False)
-    logger.info("Wrote %s (%d rows)", output_path, len(df))
+    write_forecast_parquet(df, output_path)
     return output_path
 
 
@@ -367,7 +580,7 @@ def convert_country_month(
         csv_path: Path to input country-month CSV file.
         output_path: Path where parquet file will be written.
         month_lookup: Dictionary mapping month IDs to YYYY-MM strings.
-        centroids: DataFrame with country centroid coordinates.
+        centroids: DataFrame with country centroid coordinates indexed by country_id.
         overwrite: Whether to overwrite existing output file.
 
     Returns:
@@ -381,47 +594,53 @@ def convert_country_month(
         raise FileExistsError(f"{output_path} already exists. Use --overwrite to replace it.")
 
     logger.info("Processing country-month file %s", csv_path)
-    df = pd.read_csv(csv_path)
-    if df.empty:
+    table = read_csv_cached(csv_path, CM_CSV_COLUMNS)
+    if table.num_rows == 0:
         raise ValueError(f"Input file {csv_path} has no rows")
 
-    df = df.rename(
-        columns={
-            "main_mean": "map",
-            "main_dich": "prob_1",
-            "isoab": "country_id",
-        }
-    )
+    renames = {
+        "main_mean": "map",
+        "main_dich": "prob_1",
+        "isoab": "country_id",
+    }
+    table = table.rename_columns([renames.get(name, name) for name in table.column_names])
 
     required = {"country_id", "year", "month", "map", "prob_1"}
-    missing = required - set(df.columns)
+    missing = required - set(table.column_names)
     if missing:
         raise ValueError(f"Missing expected columns in {csv_path}: {sorted(missing)}")
 
+    # Split blocks so pandas adopts each Arrow column without consolidating copies.
+    df = coerce_metrics_arrow(table).to_pandas(self_destruct=True, split_blocks=True)
+
     df["month"] = df["year"].astype(str) + "-" + df["month"].astype(str).str.zfill(2)
     if "month_id" in df.columns:
-        df["codebook_month"] = df["month_id"].map(month_lookup)
-
-    df = df.merge(centroids, on="country_id", how="left")
-    if df[["latitude", "longitude"]].isna().any().any():
-        missing = df.loc[df["latitude"].isna(), "country_id"].unique()
+        df["codebook_month"], _ = lookup_month_names(df["month_id"], month_lookup)
+
+    matched = centroids.reindex(df["country_id"].to_numpy())
+    for col in matched.columns:
+        df[col] = matched[col].to_numpy()
+    missing_mask = _missing_coordinates(df)
+    if missing_mask.any():
+        missing = df.loc[missing_mask, "country_id"].unique()
         raise ValueError(
             f"Centroid lookup missing latitude/longitude for countries {sorted(missing)}"
         )
 
-    # Create synthetic grid ids so rows can co-exist with PRIO-GRID cells
-    df = df.sort_values(["country_id", "month"])
-    df["grid_id"] = df["country_id"].astype("category").cat.codes.astype(int) + 10_000_000
+    # Create synthetic grid ids so rows can co-exist with PRIO-GRID cells. The
+    # frame is already sorted by country, so appearance order is sorted order.
+    df.sort_values(["country_id", "month"], inplace=True)
+    codes, _ = pd.factorize(df["country_id"].to_numpy(), sort=False)
+    df["grid_id"] = codes.astype(np.int64, copy=False) + 10_000_000
 
-    df["admin_1_id"] = None
-    df["admin_2_id"] = None
+    # Typed all-null string columns rather than object columns of None, so the
+    # written schema matches PRIO-GRID outputs instead of Arrow's null type.
+    df["admin_1_id"] = pd.Series(pd.NA, index=df.index, dtype="string")
+    df["admin_2_id"] = pd.Series(pd.NA, index=df.index, dtype="string")
 
-    df = ensure_metric_columns(df)
     df = reorder_columns(df)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(output_path, index=False)
-    logger.info("Wrote %s (%d rows)", output_path, len(df))
+    write_forecast_parquet(df, output_path)
     return output_path
 
 
@@ -446,13 +665,13 @@ def main() -> None:
         logger.error(
             "PRIO-GRID CSV found but no lookup provided. Supply --priogrid-lookup to convert pgm data."
         )
-    for csv in pgm_files:
+    for csv_path in pgm_files:
         if priogrid_lookup is None:
             continue
-        out_name = csv.stem.replace("_t01", "") + "_pgm.parquet"
+        out_name = csv_path.stem.replace("_t01", "") + "_pgm.parquet"
         output_path = args.output_dir / out_name
         outputs.append(
-            convert_priogrid(csv, output_path, month_lookup, priogrid_lookup, args.overwrite)
+            convert_priogrid(csv_path, output_path, month_lookup, priogrid_lookup, args.overwrite)
         )
 
     cm_files = sorted(args.raw_dir.glob("*_cm.csv"))
@@ -460,13 +679,15 @@ def main() -> None:
         logger.warning(
             "Country-month CSV detected but no centroid lookup supplied; skipping cm conversion."
         )
-    for csv in cm_files:
+    for csv_path in cm_files:
         if country_centroids is None:
             continue
-        out_name = csv.stem.replace("_t01", "") + "_cm.parquet"
+        out_name = csv_path.stem.replace("_t01", "") + "_cm.parquet"
         output_path = args.output_dir / out_name
         outputs.append(
-            convert_country_month(csv, output_path, month_lookup, country_centroids, args.overwrite)
+            convert_country_month(
+                csv_path, output_path, month_lookup, country_centroids, args.overwrite
+            )
         )
 
     if not outputs:
@@ -7,14 +7,20 @@ import argparse
 import sqlite3
 import sys
 import tempfile
-from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
     from botocore import UNSIGNED
     from botocore.config import Config
     from botocore.exceptions import BotoCoreError, ClientError
@@ -23,6 +29,7 @@ except ModuleNotFoundError:  # pragma: no cover - boto3 optional for local workf
     BotoCoreError = ClientError = Exception
     UNSIGNED = None
     Config = None
+    TransferConfig = None
 
 # Allow running the script directly (`python scripts/load_parquet_to_db.py`)
 if __package__ in {None, ""}:
@@ -34,6 +41,56 @@ from app.services.db_utils import sqlite_path_from_url
 from app.services.sample_data import FORECAST_COLUMNS, FORECAST_SCHEMA
 from scripts.prepare_views_forecasts import prepare_forecast_dataframe
 
+# Rows per record batch when streaming API-ready parquet files into SQLite.
+BATCH_ROWS = 200_000
+
+# Full-frame checks derived from FORECAST_SCHEMA; see validate_forecast_chunk.
+NUMERIC_DTYPES = {
+    name: str(column.dtype)
+    for name, column in FORECAST_SCHEMA.columns.items()
+    if str(column.dtype) != "str"
+}
+STRING_COLUMNS = [name for name in FORECAST_COLUMNS if name not in NUMERIC_DTYPES]
+REQUIRED_COLUMNS = [name for name, column in FORECAST_SCHEMA.columns.items() if not column.nullable]
+NON_NEGATIVE_COLUMNS = ["map", *(name for name in FORECAST_COLUMNS if name.startswith("ci_"))]
+PROBABILITY_COLUMNS = [name for name in FORECAST_COLUMNS if name.startswith("prob_")]
+
+# Rows per executemany call when inserting validated chunks.
+INSERT_BATCH_ROWS = 50_000
+
+# SQLite column affinities mirroring FORECAST_SCHEMA; unlisted columns are REAL.
+SQLITE_COLUMN_TYPES = {
+    "grid_id": "INTEGER",
+    "country_id": "TEXT",
+    "admin_1_id": "TEXT",
+    "admin_2_id": "TEXT",
+    "month": "TEXT",
+}
+CREATE_TABLE_SQL = "CREATE TABLE IF NOT EXISTS forecasts ({})".format(
+    ", ".join(f"{name} {SQLITE_COLUMN_TYPES.get(name, 'REAL')}" for name in FORECAST_COLUMNS)
+)
+INSERT_SQL = "INSERT INTO forecasts ({}) VALUES ({})".format(
+    ", ".join(FORECAST_COLUMNS), ", ".join("?" for _ in FORECAST_COLUMNS)
+)
+
+# Index name -> indexed columns. (month, country_id) serves the API's
+# month/country filters and also covers month-only lookups.
+FORECAST_INDEXES = {
+    "idx_forecasts_month_country": "month, country_id",
+    "idx_forecasts_country": "country_id",
+    "idx_forecasts_grid": "grid_id",
+}
+# Superseded indexes dropped from databases built by earlier versions.
+LEGACY_FORECAST_INDEXES = ("idx_forecasts_month",)
+
+# Concurrent S3 object downloads, and multipart settings for large objects.
+S3_DOWNLOAD_WORKERS = 16
+S3_PART_CONCURRENCY = 4
+S3_MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+# Every object worker may have S3_PART_CONCURRENCY requests in flight on the
+# shared client, so its connection pool is sized for the full fan-out.
+S3_MAX_POOL_CONNECTIONS = S3_DOWNLOAD_WORKERS * S3_PART_CONCURRENCY
+
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     """Parse command line arguments for database loading.
@@ -138,10 +195,10 @@ def download_from_s3(
     session = boto3.session.Session(**session_kwargs)
     credentials = session.get_credentials()
 
-    if credentials:
-        client = session.client("s3")
-    else:
-        client = session.client("s3", config=Config(signature_version=UNSIGNED))
+    client_config = Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS)
+    if not credentials:
+        client_config = client_config.merge(Config(signature_version=UNSIGNED))
+    client = session.client("s3", config=client_config)
 
     object_keys: List[str] = []
 
@@ -165,17 +222,22 @@ def download_from_s3(
             "No parquet objects found in S3. Adjust --s3-prefix/--s3-key or ensure the bucket contains data."
         )
 
-    downloaded: List[Path] = []
-    for key in sorted(set(object_keys)):
-        local_path = destination / Path(key).name
-        local_path.parent.mkdir(parents=True, exist_ok=True)
+    transfer_config = TransferConfig(
+        max_concurrency=S3_PART_CONCURRENCY, multipart_chunksize=S3_MULTIPART_CHUNKSIZE
+    )
 
+    def download(key: str) -> Path:
+        local_path = s3_local_path(destination, key, normalized_prefix)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            client.download_file(bucket, key, str(local_path))
+            client.download_file(bucket, key, str(local_path), Config=transfer_config)
         except (ClientError, BotoCoreError) as exc:
             raise SystemExit(f"Failed to download s3://{bucket}/{key}: {exc}") from exc
+        return local_path
 
-        downloaded.append(local_path)
+    # Downloads are network bound, so overlap them; map preserves key order.
+    with ThreadPoolExecutor(max_workers=S3_DOWNLOAD_WORKERS) as executor:
+        downloaded = list(executor.map(download, sorted(set(object_keys))))
 
     if not downloaded:
         raise SystemExit("No parquet files were downloaded from S3.")
@@ -187,53 +249,203 @@ def download_from_s3(
     return downloaded
 
 
-def load_parquet_frames(parquet_files: Iterable[Path]) -> pd.DataFrame:
-    """Load and validate parquet files into a DataFrame.
+def s3_local_path(destination: Path, key: str, prefix: Optional[str] = None) -> Path:
+    """Map an S3 key to a unique path under ``destination``.
+
+    The key's path below the directory part of ``prefix`` is kept, so
+    objects sharing a basename under different prefixes never write to the
+    same file.
+
+    Args:
+        destination: Local download directory.
+        key: S3 object key.
+        prefix: Listing prefix; its directory part is stripped from keys under it.
+
+    Returns:
+        Local file path for the object.
+
+    Raises:
+        SystemExit: If the key would resolve outside ``destination``.
+    """
+    relative = key
+    prefix_dir = (prefix or "")[: (prefix or "").rfind("/") + 1]
+    if prefix_dir and key.startswith(prefix_dir):
+        relative = key[len(prefix_dir) :]
+    parts = [part for part in PurePosixPath(relative).parts if part not in {"", "/"}]
+    if not parts or ".." in parts:
+        raise SystemExit(f"Refusing to download S3 key {key!r} outside {destination}")
+    return destination.joinpath(*parts)
+
+
+def iter_validated_frames(parquet_files: Iterable[Path]) -> Iterator[pd.DataFrame]:
+    """Yield normalized and validated forecast chunks from parquet files.
 
     Args:
         parquet_files: Paths to parquet files to load.
 
+    Yields:
+        Validated DataFrame chunks with columns ordered as FORECAST_COLUMNS.
+    """
+    for chunk in iter_forecast_frames(list(parquet_files)):
+        chunk = normalize_forecast_frame(chunk)
+        yield validate_forecast_chunk(chunk)
+
+
+def validate_forecast_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Validate a forecast chunk and coerce it to the schema's column types.
+
+    The pandera schema only runs on a sample row to check the column set and
+    type coercibility, since parquet already fixes the column types. Missing
+    values and value ranges are checked on every row with NumPy comparisons.
+
+    Args:
+        chunk: Normalized forecast DataFrame.
+
     Returns:
-        Validated DataFrame with forecast data.
+        DataFrame with columns ordered as FORECAST_COLUMNS and numeric
+        columns cast to their schema dtypes.
+
+    Raises:
+        SchemaErrors: If the sample row does not match FORECAST_SCHEMA.
+        ValueError: If required values are missing or out of range.
     """
-    df = build_forecast_dataframe(list(parquet_files))
-    df = normalize_forecast_frame(df)
-    df = FORECAST_SCHEMA.validate(df, lazy=True)
-    return df[FORECAST_COLUMNS]
+    FORECAST_SCHEMA.validate(chunk.head(1), lazy=True)
+    chunk = chunk[FORECAST_COLUMNS].astype(NUMERIC_DTYPES)
+
+    missing = chunk[REQUIRED_COLUMNS].isna().any()
+    if missing.any():
+        raise ValueError(f"Missing values in required columns: {list(missing.index[missing])}")
+
+    for columns, upper in ((NON_NEGATIVE_COLUMNS, np.inf), (PROBABILITY_COLUMNS, 1.0)):
+        values = chunk[columns].to_numpy()
+        in_range = ((values >= 0) & (values <= upper)).all(axis=0)
+        if not in_range.all():
+            bad = [name for name, ok in zip(columns, in_range) if not ok]
+            raise ValueError(f"Values out of range in columns: {bad}")
 
+    for name in STRING_COLUMNS:
+        column = chunk[name]
+        if pd.api.types.is_numeric_dtype(column):
+            chunk[name] = column.where(column.isna(), column.astype(str))
 
-def build_forecast_dataframe(parquet_files: List[Path]) -> pd.DataFrame:
-    """Build consolidated forecast DataFrame from parquet files.
+    return chunk
+
+
+def iter_forecast_frames(parquet_files: List[Path]) -> Iterator[pd.DataFrame]:
+    """Yield forecast data from parquet files in bounded chunks.
 
     Automatically detects file format (API-ready or raw VIEWS) and
-    processes accordingly.
+    processes accordingly. API-ready files are scanned as one
+    ``pyarrow.dataset`` and streamed in record batches of ``BATCH_ROWS``
+    rows; raw VIEWS pairs are prepared one pair at a time.
 
     Args:
         parquet_files: List of parquet file paths.
 
-    Returns:
-        Consolidated DataFrame with all forecast data.
+    Yields:
+        DataFrame chunks with forecast data.
 
     Raises:
         FileNotFoundError: If no parquet files provided.
         SystemExit: If file format cannot be determined.
     """
+    by_type, handles, available_columns = group_parquet_files(parquet_files)
+    try:
+        yield from _iter_grouped_frames(by_type, handles, available_columns)
+    finally:
+        # Also runs when the consumer abandons the generator or a chunk fails.
+        close_parquet_files(handles)
+
+
+def group_parquet_files(
+    parquet_files: List[Path],
+) -> Tuple[Dict[str, List[Path]], List[pq.ParquetFile], Dict[Path, List[str]]]:
+    """Classify parquet files and collect the forecast columns each provides.
+
+    Each file footer is parsed once; API-ready files keep their open
+    ``ParquetFile`` handle so streaming reads do not parse it again. The
+    caller owns the returned handles and must pass them to
+    ``close_parquet_files``.
+
+    Args:
+        parquet_files: List of parquet file paths.
+
+    Returns:
+        Tuple of files grouped by classification, open handles positionally
+        aligned with the API-ready files (a path listed twice gets two
+        handles), and the FORECAST_COLUMNS available in each file.
+
+    Raises:
+        FileNotFoundError: If no parquet files provided.
+        SystemExit: If a parquet footer cannot be read.
+    """
     if not parquet_files:
         raise FileNotFoundError("No parquet files found to load")
 
-    by_type = {"api_ready": [], "raw_preds": [], "raw_hdi": [], "unknown": []}
-
-    for path in parquet_files:
-        file_type = classify_parquet_file(path)
-        by_type[file_type].append(path)
+    by_type: Dict[str, List[Path]] = {
+        "api_ready": [],
+        "raw_preds": [],
+        "raw_hdi": [],
+        "unknown": [],
+    }
+    handles: List[pq.ParquetFile] = []
+    available_columns: Dict[Path, List[str]] = {}
 
-    if by_type["api_ready"]:
-        frames = [pd.read_parquet(path) for path in by_type["api_ready"]]
-        return pd.concat(frames, ignore_index=True)
+    try:
+        for path in parquet_files:
+            try:
+                parquet_file = pq.ParquetFile(path)
+            except Exception as exc:  # pragma: no cover - defensive
+                raise SystemExit(f"Unable to read parquet schema for {path}: {exc}") from exc
+
+            try:
+                file_type, columns = classify_parquet_file(parquet_file)
+            except BaseException:
+                parquet_file.close()
+                raise
+            by_type[file_type].append(path)
+            available_columns[path] = columns
+            if file_type == "api_ready":
+                handles.append(parquet_file)
+            else:
+                parquet_file.close()
+    except BaseException:
+        close_parquet_files(handles)
+        raise
+
+    return by_type, handles, available_columns
+
+
+def close_parquet_files(handles: List[pq.ParquetFile]) -> None:
+    """Close parquet handles returned by ``group_parquet_files``."""
+    for parquet_file in handles:
+        parquet_file.close()
+
+
+def _iter_grouped_frames(
+    by_type: Dict[str, List[Path]],
+    handles: List[pq.ParquetFile],
+    available_columns: Dict[Path, List[str]],
+) -> Iterator[pd.DataFrame]:
+    api_ready = by_type["api_ready"]
+    if api_ready:
+        batches = _scan_api_ready_files(api_ready, handles, available_columns)
+        if batches is None:
+            # Files whose schemas cannot be unified are read one at a time.
+            batches = (
+                batch
+                for path, parquet_file in zip(api_ready, handles)
+                for batch in parquet_file.iter_batches(
+                    batch_size=BATCH_ROWS, columns=available_columns[path]
+                )
+            )
+        for batch in batches:
+            if batch.num_rows:
+                yield batch.to_pandas()
+        return
 
     if by_type["raw_preds"] and by_type["raw_hdi"]:
         hdi_index = {_raw_key(path): path for path in by_type["raw_hdi"]}
-        prepared_frames: List[pd.DataFrame] = []
 
         for preds_path in by_type["raw_preds"]:
             key = _raw_key(preds_path)
@@ -243,9 +455,8 @@ def build_forecast_dataframe(parquet_files: List[Path]) -> pd.DataFrame:
                     f"No matching _90_hdi parquet found for raw predictions file {preds_path.name}"
                 )
 
-            prepared_frames.append(prepare_forecast_dataframe(preds_path, hdi_path))
-
-        return pd.concat(prepared_frames, ignore_index=True)
+            yield prepare_forecast_dataframe(preds_path, hdi_path)
+        return
 
     raise SystemExit(
         "Unable to determine parquet format. Provide API-ready parquet files or "
@@ -253,35 +464,53 @@ def build_forecast_dataframe(parquet_files: List[Path]) -> pd.DataFrame:
     )
 
 
-def classify_parquet_file(path: Path) -> str:
+def _scan_api_ready_files(
+    api_ready: List[Path],
+    handles: List[pq.ParquetFile],
+    available_columns: Dict[Path, List[str]],
+) -> Optional[Iterator[pa.RecordBatch]]:
+    """Stream API-ready files as one dataset, or return None if their schemas conflict.
+
+    The scan projects every forecast column any file provides; the unified
+    schema makes it fill nulls for files that lack a column.
+    """
+    columns = [
+        name
+        for name in FORECAST_COLUMNS
+        if any(name in available_columns[path] for path in api_ready)
+    ]
+    try:
+        schema = pa.unify_schemas([handle.schema_arrow for handle in handles])
+        dataset = ds.dataset([str(path) for path in api_ready], format="parquet", schema=schema)
+        return dataset.to_batches(columns=columns, batch_size=BATCH_ROWS, use_threads=True)
+    except (pa.ArrowException, OSError):
+        return None
+
+
+def classify_parquet_file(parquet_file: pq.ParquetFile) -> Tuple[str, List[str]]:
     """Classify parquet file type based on schema.
 
     Args:
-        path: Path to parquet file.
+        parquet_file: Open parquet file whose footer has been read.
 
     Returns:
-        Classification string: 'api_ready', 'raw_preds', 'raw_hdi', or 'unknown'.
-
-    Raises:
-        SystemExit: If parquet schema cannot be read.
+        Tuple of the classification string ('api_ready', 'raw_preds', 'raw_hdi',
+        or 'unknown') and the FORECAST_COLUMNS present in the file, so API-ready
+        reads can project only those columns.
     """
-    try:
-        schema = pq.read_schema(path)
-    except Exception as exc:  # pragma: no cover - defensive
-        raise SystemExit(f"Unable to read parquet schema for {path}: {exc}") from exc
-
-    column_names = set(schema.names)
+    column_names = set(parquet_file.schema_arrow.names)
+    forecast_columns = [name for name in FORECAST_COLUMNS if name in column_names]
 
     if {"grid_id", "month", "map"}.issubset(column_names):
-        return "api_ready"
+        return "api_ready", forecast_columns
 
     if "pred_ln_sb_best" in column_names:
-        return "raw_preds"
+        return "raw_preds", forecast_columns
 
     if {"pred_ln_sb_best_hdi_lower", "pred_ln_sb_best_hdi_upper"}.issubset(column_names):
-        return "raw_hdi"
+        return "raw_hdi", forecast_columns
 
-    return "unknown"
+    return "unknown", forecast_columns
 
 
 def _raw_key(path: Path) -> str:
@@ -316,25 +545,22 @@ def normalize_forecast_frame(df: pd.DataFrame) -> pd.DataFrame:
     """
 
     if "country_id" in df.columns:
-        # Normalize country identifiers to zero-padded UN M49 codes when numeric.
-        country_series = df["country_id"].astype("object")
-
-        non_null_mask = country_series.notna()
-        non_null_values = country_series[non_null_mask].astype(str).str.strip()
-        non_null_values = non_null_values.str.replace(r"\.0$", "", regex=True)
-        non_null_values = non_null_values.apply(
-            lambda value: value.zfill(3) if value.isdigit() else value
-        )
-
-        invalid_mask = ~non_null_values.str.fullmatch(r"\d{3}")
-        if invalid_mask.any():
-            sample = non_null_values[invalid_mask].unique()[:5]
+        # Normalize country identifiers to zero-padded UN M49 codes when numeric,
+        # in one pass of Arrow string kernels over contiguous UTF-8 buffers.
+        values = pa.array(df["country_id"].astype("string"))
+        values = pc.utf8_trim_whitespace(values)
+        values = pc.replace_substring_regex(values, r"\.0$", "")
+        digit_mask = pc.match_substring_regex(values, r"^\d+$")
+        values = pc.if_else(digit_mask, pc.utf8_lpad(values, 3, "0"), values)
+
+        invalid_mask = pc.fill_null(pc.invert(pc.match_substring_regex(values, r"^\d{3}$")), False)
+        if pc.any(invalid_mask).as_py():
+            sample = pc.unique(pc.filter(values, invalid_mask)).to_pylist()[:5]
             raise ValueError(
                 "Encountered non UN M49 country identifiers. Sample values: " f"{', '.join(sample)}"
             )
 
-        country_series.loc[non_null_mask] = non_null_values
-        df["country_id"] = country_series
+        df["country_id"] = values.to_numpy(zero_copy_only=False)
 
     return df
 
@@ -362,14 +588,66 @@ def create_indexes(conn: sqlite3.Connection) -> None:
     Args:
         conn: SQLite database connection.
     """
-    indexes = (
-        "CREATE INDEX IF NOT EXISTS idx_forecasts_month ON forecasts(month)",
-        "CREATE INDEX IF NOT EXISTS idx_forecasts_country ON forecasts(country_id)",
-        "CREATE INDEX IF NOT EXISTS idx_forecasts_grid ON forecasts(grid_id)",
-    )
+    for name, columns in FORECAST_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON forecasts({columns})")
 
-    for statement in indexes:
-        conn.execute(statement)
+
+def drop_indexes(conn: sqlite3.Connection) -> None:
+    """Drop forecast indexes so bulk inserts skip per-row B-tree maintenance.
+
+    Args:
+        conn: SQLite database connection.
+    """
+    for name in (*FORECAST_INDEXES, *LEGACY_FORECAST_INDEXES):
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def write_forecasts(conn: sqlite3.Connection, parquet_files: Iterable[Path], mode: str) -> int:
+    """Stream validated forecast chunks into the forecasts table.
+
+    The whole load runs in a single transaction, so a failed validation
+    leaves the existing table untouched.
+
+    Args:
+        conn: SQLite database connection.
+        parquet_files: Paths to parquet files to load.
+        mode: ``replace`` to drop the existing table first, or ``append``.
+
+    Returns:
+        Number of rows written.
+    """
+    if conn.in_transaction:
+        conn.commit()
+
+    # Durability is not needed mid-load; a failed run is simply rerun. The
+    # journal stays in memory rather than off so the load can still roll back.
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA journal_mode=MEMORY")
+    conn.execute("PRAGMA cache_size=-262144")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+    rows_written = 0
+    conn.execute("BEGIN")
+    try:
+        if mode == "replace":
+            conn.execute("DROP TABLE IF EXISTS forecasts")
+        conn.execute(CREATE_TABLE_SQL)
+        # Indexes are rebuilt once after the insert instead of updated per row.
+        drop_indexes(conn)
+
+        for chunk in iter_validated_frames(parquet_files):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            for batch in table.to_batches(max_chunksize=INSERT_BATCH_ROWS):
+                conn.executemany(INSERT_SQL, zip(*(column.to_pylist() for column in batch.columns)))
+            rows_written += len(chunk)
+
+        create_indexes(conn)
+    except BaseException:
+        conn.rollback()
+        raise
+
+    conn.commit()
+    return rows_written
 
 
 def main(argv: Sequence[str] | None = None) -> None:
@@ -386,6 +664,19 @@ def main(argv: Sequence[str] | None = None) -> None:
         raise SystemExit("Use either --source or the S3 options, not both.")
 
     database_url = args.database_url or settings.database_url
+    db_path = sqlite_path_from_url(database_url)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if args.reset_db and db_path.exists():
+        db_path.unlink()
+        print(f"Removed existing database at {db_path}")
+
+    if args.skip_if_exists:
+        with sqlite3.connect(db_path) as conn:
+            if database_has_rows(conn):
+                print(f"Database at {db_path} already populated; skipping load.")
+                return
+
     temp_dir: Optional[tempfile.TemporaryDirectory] = None
 
     try:
@@ -432,31 +723,16 @@ def main(argv: Sequence[str] | None = None) -> None:
                     "Provide --source or configure S3 settings to download data."
                 )
 
-        df = load_parquet_frames(parquet_files)
+        # Downloaded files must outlive the streaming load, so write inside the try.
+        with sqlite3.connect(db_path) as conn:
+            rows_written = write_forecasts(conn, parquet_files, args.mode)
+            row_count = conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
     finally:
         if temp_dir is not None:
             temp_dir.cleanup()
 
-    db_path = sqlite_path_from_url(database_url)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
-    if args.reset_db and db_path.exists():
-        db_path.unlink()
-        print(f"Removed existing database at {db_path}")
-
-    with sqlite3.connect(db_path) as conn:
-        if args.skip_if_exists and database_has_rows(conn):
-            print(f"Database at {db_path} already populated; skipping load.")
-            return
-
-        # Pandas will create the table schema for us when writing.
-        df.to_sql("forecasts", conn, if_exists=args.mode, index=False)
-        create_indexes(conn)
-
-        row_count = conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
-
     print(
-        f"Loaded {len(df):,} rows into {db_path} (table=forecasts). "
+        f"Loaded {rows_written:,} rows into {db_path} (table=forecasts). "
         f"Database now holds {row_count:,} rows."
     )
 
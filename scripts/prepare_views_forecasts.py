@@ -5,13 +5,18 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 import numpy as np
 import pandas as pd
-from pandera import Check, Column, DataFrameSchema
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pandera import Column, DataFrameSchema
 
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -22,26 +27,55 @@ logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
 BASE_PERIOD = pd.Period("1990-01", freq="M")
+# Size of the month label table (month_id 1..N); larger ids are formatted
+# arithmetically instead of growing the table.
+MONTH_LUT_SIZE = 1024
+
+# Pandera validation of the raw inputs and the prepared output is opt-in for
+# CI and development runs (VIEWS_STRICT=1 or --validate). Production runs rely
+# on the parquet column types and the structural checks in this module.
+STRICT = os.getenv("VIEWS_STRICT") == "1"
+
+# Quantiles reported from the draws: 50% and 99% interval bounds, in that order.
+QUANTILES = (0.25, 0.75, 0.005, 0.995)
+THRESHOLDS = (1, 10, 100, 1000, 10000)
+# Rows of draws compared against every threshold before moving on (~1 MiB).
+THRESHOLD_BLOCK_BYTES = 1 << 20
+
+# --compact storage: probabilities as uint8 steps of PROBABILITY_SCALE and the
+# point/interval values as float16. The scale is recorded in field metadata.
+PROBABILITY_SCALE = 255
+COMPACT_FLOAT_PREFIXES = ("map", "ci_")
+
+# Arrow types of the written file. Every value column is computed as float32
+# already; converting each month slice against this schema pins the types in
+# one pass (string admin columns even when they are all null).
+OUTPUT_SCHEMA = pa.schema(
+    [
+        ("grid_id", pa.int32()),
+        ("latitude", pa.float32()),
+        ("longitude", pa.float32()),
+        ("country_id", pa.string()),
+        ("admin_1_id", pa.string()),
+        ("admin_2_id", pa.string()),
+        ("month", pa.string()),
+    ]
+    + [(name, pa.float32()) for name in FORECAST_COLUMNS[FORECAST_COLUMNS.index("map") :]]
+)
 
+# (month_id, priogrid_id) pairs listed when HDI bounds are missing.
+MAX_REPORTED_CELLS = 20
 
-def _is_array_like(value: object) -> bool:
-    """Check if value is array-like (list, tuple, or ndarray).
+# Zero-padded UN M49 codes indexed by numeric country id; gathering from this
+# table shares 1000 string objects instead of formatting one per row.
+COUNTRY_CODE_LUT = np.array([f"{code:03d}" for code in range(1000)], dtype=object)
 
-    Args:
-        value: Object to check.
-
-    Returns:
-        True if value is array-like.
-    """
-    return isinstance(value, (list, tuple, np.ndarray))
+# Only these columns are read from the raw drops; any other columns in the
+# VIEWS files are never decoded.
+PRED_COLUMNS = ["month_id", "priogrid_id", "country_id", "lat", "lon", "pred_ln_sb_best"]
+HDI_COLUMNS = ["month_id", "priogrid_id", "pred_ln_sb_best_hdi_lower", "pred_ln_sb_best_hdi_upper"]
 
 
-ARRAY_LIKE_CHECK = Check(
-    lambda s: s.apply(_is_array_like).all(),
-    element_wise=False,
-    error="pred_ln_sb_best column must contain array-like draws",
-)
-
 RAW_PRED_SCHEMA = DataFrameSchema(
     {
         "month_id": Column("int32", coerce=True),
@@ -49,7 +83,6 @@ RAW_PRED_SCHEMA = DataFrameSchema(
         "country_id": Column("int32", coerce=True),
         "lat": Column("float64", coerce=True),
         "lon": Column("float64", coerce=True),
-        "pred_ln_sb_best": Column(object, checks=ARRAY_LIKE_CHECK),
     },
     strict=False,
     coerce=True,
@@ -98,37 +131,195 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Overwrite the output file if it exists",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help=(
+            "Store probabilities as uint8 (value / 255) and map/CI columns as float16; "
+            "the output no longer matches the API schema"
+        ),
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        default=STRICT,
+        help="Validate inputs and output with the pandera schemas (default: VIEWS_STRICT=1)",
+    )
     return parser.parse_args()
 
 
-def load_preds(parquet_path: Path) -> pd.DataFrame:
+def load_preds(
+    parquet_path: Path, validate: Optional[bool] = None
+) -> tuple[pd.DataFrame, np.ndarray]:
     """Load prediction data from parquet file.
 
+    The draws are copied straight from Arrow's flat list buffer into a
+    preallocated matrix, so no per-row arrays are ever created.
+
     Args:
         parquet_path: Path to predictions parquet file.
+        validate: Run RAW_PRED_SCHEMA on the frame; defaults to STRICT.
 
     Returns:
-        DataFrame with validated prediction data.
+        Tuple of the prediction data without the draws column and a
+        contiguous float32 matrix of draws with one row per DataFrame row.
     """
-    df = pd.read_parquet(parquet_path).reset_index()
-    df = RAW_PRED_SCHEMA.validate(df, lazy=True)
-    df["pred_ln_sb_best"] = df["pred_ln_sb_best"].apply(
-        lambda arr: np.asarray(arr, dtype=np.float32)
-    )
-    return df
+    table = pq.read_table(parquet_path, columns=PRED_COLUMNS, memory_map=True)
+    draws = draws_matrix(table.column("pred_ln_sb_best"))
+    df = table_to_frame(table.drop_columns(["pred_ln_sb_best"]))
+    if validate is None:
+        validate = STRICT
+    if validate:
+        df = RAW_PRED_SCHEMA.validate(df, lazy=True)
+    return df, draws
+
+
+def table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """Wrap the columns of a flat numeric table in a DataFrame.
+
+    Single-chunk columns without nulls become read-only NumPy views of the
+    Arrow buffers, so the numeric data is not copied a second time the way
+    a full ``to_pandas`` conversion would. Any pandas index stored in the
+    file metadata is ignored; index columns come back as ordinary columns.
+
+    Args:
+        table: Arrow table of primitive columns.
+
+    Returns:
+        DataFrame with a RangeIndex and one column per table column.
+    """
+    columns = {name: table.column(name).to_numpy() for name in table.column_names}
+    return pd.DataFrame(columns, copy=False)
 
 
-def load_hdi(parquet_path: Path) -> pd.DataFrame:
+def draws_matrix(column: pa.ChunkedArray) -> np.ndarray:
+    """Copy a list column of equal-length draws into a float32 matrix.
+
+    Args:
+        column: Arrow list column with one array of draws per row.
+
+    Returns:
+        Matrix of shape (rows, draws).
+
+    Raises:
+        ValueError: If the column is not a list column or rows have missing
+            or unequal numbers of draws.
+    """
+    list_types = (pa.types.is_list, pa.types.is_large_list, pa.types.is_fixed_size_list)
+    if not any(is_type(column.type) for is_type in list_types):
+        raise ValueError("pred_ln_sb_best column must contain array-like draws")
+    if column.null_count:
+        raise ValueError("pred_ln_sb_best column contains rows without draws")
+    if len(column) == 0:
+        return np.empty((0, 0), dtype=np.float32)
+
+    lengths = pc.min_max(pc.list_value_length(column)).as_py()
+    if lengths["min"] != lengths["max"]:
+        raise ValueError("pred_ln_sb_best rows must all have the same number of draws")
+
+    draws = np.empty((len(column), lengths["max"]), dtype=np.float32)
+    row = 0
+    for chunk in column.chunks:
+        values = chunk.flatten().to_numpy(zero_copy_only=False)
+        draws[row : row + len(chunk)] = values.reshape(len(chunk), -1)
+        row += len(chunk)
+    return draws
+
+
+def load_hdi(parquet_path: Path, validate: Optional[bool] = None) -> pd.DataFrame:
     """Load HDI (High Density Interval) data from parquet.
 
     Args:
         parquet_path: Path to HDI parquet file.
+        validate: Run RAW_HDI_SCHEMA on the frame; defaults to STRICT.
+
+    Returns:
+        DataFrame with HDI bounds.
+    """
+    df = table_to_frame(pq.read_table(parquet_path, columns=HDI_COLUMNS, memory_map=True))
+    if validate is None:
+        validate = STRICT
+    if validate:
+        df = RAW_HDI_SCHEMA.validate(df, lazy=True)
+    return df
+
+
+def _require_ids(name: str, values: np.ndarray | pd.Series) -> None:
+    """Reject missing identifiers before they are cast to integers.
+
+    Casting a float column with NaN to int64 yields arbitrary values, and the
+    pandera schemas that would catch it only run with ``--validate``.
+
+    Raises:
+        ValueError: If ``values`` contains a missing value.
+    """
+    missing = int(pd.isna(values).sum())
+    if missing:
+        raise ValueError(f"{name} has {missing} missing values")
+
+
+def cell_keys(df: pd.DataFrame) -> np.ndarray:
+    """Pack (month_id, priogrid_id) into one int64 key per row.
+
+    Args:
+        df: Frame with integer ``month_id`` and ``priogrid_id`` columns.
+
+    Returns:
+        Array of keys with the month in the high 32 bits.
+
+    Raises:
+        ValueError: If either id column has missing values.
+    """
+    for column in ("month_id", "priogrid_id"):
+        _require_ids(column, df[column])
+    month = df["month_id"].to_numpy(dtype=np.int64)
+    grid = df["priogrid_id"].to_numpy(dtype=np.int64)
+    return (month << 32) | (grid & 0xFFFFFFFF)
+
+
+def join_hdi_bounds(preds_df: pd.DataFrame, hdi_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Look up the HDI bounds for every prediction row.
+
+    Both sides are keyed on a packed (month_id, priogrid_id) int64; the HDI
+    keys are sorted once and each prediction key is found by binary search.
+
+    Args:
+        preds_df: Prediction rows, in the order the bounds are returned.
+        hdi_df: HDI rows with ``pred_ln_sb_best_hdi_lower``/``_upper`` columns.
 
     Returns:
-        DataFrame with validated HDI bounds.
+        Tuple of (lower, upper) float64 arrays aligned with ``preds_df``;
+        rows without HDI bounds are NaN.
+
+    Raises:
+        ValueError: If either input repeats a (month_id, priogrid_id) pair.
     """
-    df = pd.read_parquet(parquet_path).reset_index()
-    return RAW_HDI_SCHEMA.validate(df, lazy=True)
+    preds_keys = cell_keys(preds_df)
+    hdi_keys = cell_keys(hdi_df)
+
+    order = np.argsort(hdi_keys, kind="stable")
+    sorted_keys = hdi_keys[order]
+    if np.any(sorted_keys[1:] == sorted_keys[:-1]):
+        raise ValueError("HDI data contains duplicate (month_id, priogrid_id) rows")
+    sorted_preds = np.sort(preds_keys)
+    if np.any(sorted_preds[1:] == sorted_preds[:-1]):
+        raise ValueError("Prediction data contains duplicate (month_id, priogrid_id) rows")
+
+    if len(sorted_keys) == 0:
+        missing = np.full(len(preds_keys), np.nan)
+        return missing, missing.copy()
+
+    positions = np.searchsorted(sorted_keys, preds_keys)
+    np.minimum(positions, len(sorted_keys) - 1, out=positions)
+    found = sorted_keys[positions] == preds_keys
+    rows = order[positions]
+
+    bounds = []
+    for col in ("pred_ln_sb_best_hdi_lower", "pred_ln_sb_best_hdi_upper"):
+        values = hdi_df[col].to_numpy(dtype=np.float64)[rows]
+        values[~found] = np.nan
+        bounds.append(values)
+    return bounds[0], bounds[1]
 
 
 def month_id_to_month(month_ids: Iterable[int]) -> pd.Series:
@@ -140,29 +331,153 @@ def month_id_to_month(month_ids: Iterable[int]) -> pd.Series:
     Returns:
         Series of month strings in YYYY-MM format.
     """
-    offsets = pd.Series(month_ids, dtype="int32") - 1
-    return (BASE_PERIOD + offsets).astype(str)
+    ids = np.asarray(month_ids)
+    _require_ids("month_id", ids)
+    ids = ids.astype(np.int64, copy=False)
+    if ids.size and ids.min() < 1:
+        raise ValueError(f"month_id must be >= 1, got {ids.min()}")
+
+    lut = _month_lut()
+    in_table = ids <= len(lut)
+    if in_table.all():
+        return pd.Series(lut[ids - 1], copy=False)
+
+    labels = np.empty(len(ids), dtype=object)
+    labels[in_table] = lut[ids[in_table] - 1]
+    labels[~in_table] = _format_month_ids(ids[~in_table])
+    return pd.Series(labels, copy=False)
+
+
+_MONTH_LUT = np.empty(0, dtype=object)
+
+
+def _month_lut() -> np.ndarray:
+    """Return the YYYY-MM label table covering month ids 1..MONTH_LUT_SIZE.
+
+    Labels are formatted once per month rather than once per row; the table
+    is built on first use and never grows, whatever ids the input holds.
+    """
+    global _MONTH_LUT
+    if not len(_MONTH_LUT):
+        periods = pd.period_range(BASE_PERIOD, periods=MONTH_LUT_SIZE, freq="M")
+        _MONTH_LUT = np.asarray(periods.strftime("%Y-%m"), dtype=object)
+    return _MONTH_LUT
+
+
+def _format_month_ids(ids: np.ndarray) -> np.ndarray:
+    """Format month ids beyond the label table, once per distinct id."""
+    unique_ids, inverse = np.unique(ids, return_inverse=True)
+    offsets = unique_ids - 1 + (BASE_PERIOD.month - 1)
+    years = BASE_PERIOD.year + offsets // 12
+    months = offsets % 12 + 1
+    labels = np.array(
+        [f"{year:04d}-{month:02d}" for year, month in zip(years.tolist(), months.tolist())],
+        dtype=object,
+    )
+    return labels[inverse]
+
+
+def format_country_codes(country_ids: np.ndarray) -> np.ndarray:
+    """Format numeric country ids as zero-padded UN M49 codes.
+
+    Args:
+        country_ids: Integer country identifiers.
+
+    Returns:
+        Object array of three-character code strings.
+
+    Raises:
+        ValueError: If any id is missing or outside the three-digit UN M49 range.
+    """
+    _require_ids("country_id", country_ids)
+    codes = np.asarray(country_ids, dtype=np.int64)
+    out_of_range = (codes < 0) | (codes >= len(COUNTRY_CODE_LUT))
+    if out_of_range.any():
+        sample = np.unique(codes[out_of_range])[:5].tolist()
+        raise ValueError(f"Country ids outside the UN M49 range: {sample}")
+    return COUNTRY_CODE_LUT[codes]
 
 
 def summarise_draws(draws: np.ndarray) -> tuple[np.ndarray, np.ndarray, dict[int, np.ndarray]]:
     """Summarize forecast draws into statistics.
 
     Computes mean, quantiles, and exceedance probabilities from
-    Monte Carlo draws.
+    Monte Carlo draws. Works on a single row-major linear-scale copy of the
+    draws: quantiles come from one in-place partition of each contiguous
+    row, and threshold counts walk cache-sized blocks of rows so all
+    thresholds reuse a block while it is still cached.
 
     Args:
-        draws: Matrix of forecast draws (log scale).
+        draws: Matrix of forecast draws (log scale), one row per grid cell.
 
     Returns:
         Tuple of (mean values, quantiles array, threshold probabilities dict).
     """
-    linear = np.expm1(draws)
-    quantiles = np.quantile(linear, [0.25, 0.75, 0.005, 0.995], axis=1)
-    thresholds = {thr: (linear >= thr).mean(axis=1) for thr in (1, 10, 100, 1000, 10000)}
-    return linear.mean(axis=1), quantiles, thresholds
+    # Row-major regardless of the input layout; partitioning strided rows is slow.
+    linear = np.expm1(draws, order="C")
+    n_cells, n_draws = linear.shape
+    map_values = linear.mean(axis=1)
+
+    block_rows = max(1, THRESHOLD_BLOCK_BYTES // max(1, linear.itemsize * n_draws))
+    mask = np.empty((min(block_rows, n_cells), n_draws), dtype=bool)
+    counts = np.empty((len(THRESHOLDS), n_cells), dtype=np.intp)
+    for start in range(0, n_cells, block_rows):
+        block = linear[start : start + block_rows]
+        block_mask = mask[: len(block)]
+        for index, thr in enumerate(THRESHOLDS):
+            np.greater_equal(block, thr, out=block_mask)
+            counts[index, start : start + len(block)] = np.count_nonzero(block_mask, axis=1)
+    thresholds = {thr: counts[index] / n_draws for index, thr in enumerate(THRESHOLDS)}
+
+    # Same linear interpolation as np.quantile, read from partitioned rows.
+    positions = np.asarray(QUANTILES) * (n_draws - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, n_draws - 1)
+    linear.partition(np.unique(np.concatenate([lower, upper])), axis=1)
+    fraction = (positions - lower).astype(linear.dtype)
+    quantiles = (linear[:, lower] + (linear[:, upper] - linear[:, lower]) * fraction).T
+
+    return map_values, quantiles, thresholds
+
+
+def compute_intervals(
+    quantiles: np.ndarray, hdi_lower: np.ndarray, hdi_upper: np.ndarray
+) -> dict[str, np.ndarray]:
+    """Compute credible interval bounds on the linear scale.
+
+    Works on contiguous float32 arrays and clips lower bounds in place, so
+    each output column is allocated at most once. Float32 quantiles are
+    not copied: the returned 50% and 99% bounds are rows of ``quantiles``,
+    which is modified in place.
 
+    Args:
+        quantiles: Quantiles from ``summarise_draws``, one row per QUANTILES entry.
+        hdi_lower: Lower 90% HDI bounds on the log scale.
+        hdi_upper: Upper 90% HDI bounds on the log scale.
 
-def prepare_forecast_dataframe(preds_path: Path, hdi_path: Path) -> pd.DataFrame:
+    Returns:
+        Mapping of CI column name to float32 values.
+    """
+    ci_50_low, ci_50_high, ci_99_low, ci_99_high = quantiles.astype(np.float32, copy=False)
+    ci_90_low = np.expm1(hdi_lower, dtype=np.float32)
+    ci_90_high = np.expm1(hdi_upper, dtype=np.float32)
+
+    for lower in (ci_50_low, ci_90_low, ci_99_low):
+        np.maximum(lower, 0, out=lower)
+
+    return {
+        "ci_50_low": ci_50_low,
+        "ci_50_high": ci_50_high,
+        "ci_90_low": ci_90_low,
+        "ci_90_high": ci_90_high,
+        "ci_99_low": ci_99_low,
+        "ci_99_high": ci_99_high,
+    }
+
+
+def prepare_forecast_dataframe(
+    preds_path: Path, hdi_path: Path, validate: Optional[bool] = None
+) -> pd.DataFrame:
     """Prepare forecast DataFrame from raw VIEWS outputs.
 
     Combines predictions and HDI data, computes summary statistics,
@@ -171,6 +486,7 @@ def prepare_forecast_dataframe(preds_path: Path, hdi_path: Path) -> pd.DataFrame
     Args:
         preds_path: Path to predictions parquet file.
         hdi_path: Path to HDI bounds parquet file.
+        validate: Run the pandera schemas on inputs and output; defaults to STRICT.
 
     Returns:
         DataFrame formatted according to FORECAST_COLUMNS schema.
@@ -178,39 +494,50 @@ def prepare_forecast_dataframe(preds_path: Path, hdi_path: Path) -> pd.DataFrame
     Raises:
         ValueError: If HDI bounds are missing for any grid cells.
     """
-    preds_df = load_preds(preds_path)
-    hdi_df = load_hdi(hdi_path)
-
-    df = preds_df.merge(
-        hdi_df,
-        on=["month_id", "priogrid_id"],
-        how="left",
-        validate="one_to_one",
-    )
-
-    if df[["pred_ln_sb_best_hdi_lower", "pred_ln_sb_best_hdi_upper"]].isna().any().any():
-        missing = df.loc[
-            df["pred_ln_sb_best_hdi_lower"].isna() | df["pred_ln_sb_best_hdi_upper"].isna(),
-            ["month_id", "priogrid_id"],
-        ]
-        pairs = ", ".join(f"({m}, {g})" for m, g in missing.itertuples(index=False))
-        raise ValueError(f"Missing 90% interval bounds for grid cells: {pairs}")
-
-    draws_matrix = np.stack(df["pred_ln_sb_best"].to_numpy())
-    map_values, quantiles, threshold_probs = summarise_draws(draws_matrix)
+    if validate is None:
+        validate = STRICT
+    # Arrow releases the GIL while reading and decoding, so the two inputs
+    # load concurrently.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        preds_future = executor.submit(load_preds, preds_path, validate)
+        hdi_future = executor.submit(load_hdi, hdi_path, validate)
+        preds_df, draws = preds_future.result()
+        hdi_df = hdi_future.result()
+
+    # Put the predictions in output order (month, grid) once, up front, so
+    # every derived column is built already sorted. Inputs usually arrive
+    # sorted, in which case nothing is copied.
+    order = np.lexsort((preds_df["priogrid_id"].to_numpy(), preds_df["month_id"].to_numpy()))
+    if np.any(order != np.arange(len(order))):
+        preds_df = preds_df.take(order).reset_index(drop=True)
+        draws = draws[order]
+
+    # Bounds are gathered in preds row order, so the draws stay aligned with df.
+    df = preds_df
+    hdi_lower, hdi_upper = join_hdi_bounds(preds_df, hdi_df)
+    df["pred_ln_sb_best_hdi_lower"] = hdi_lower
+    df["pred_ln_sb_best_hdi_upper"] = hdi_upper
+
+    missing = np.isnan(hdi_lower) | np.isnan(hdi_upper)
+    if missing.any():
+        rows = np.flatnonzero(missing)
+        months = df["month_id"].to_numpy()[rows[:MAX_REPORTED_CELLS]]
+        grids = df["priogrid_id"].to_numpy()[rows[:MAX_REPORTED_CELLS]]
+        pairs = ", ".join(f"({m}, {g})" for m, g in zip(months, grids))
+        if len(rows) > MAX_REPORTED_CELLS:
+            pairs += f", ... ({len(rows) - MAX_REPORTED_CELLS} more)"
+        raise ValueError(f"Missing 90% interval bounds for {len(rows)} grid cells: {pairs}")
+
+    map_values, quantiles, threshold_probs = summarise_draws(draws)
 
     df["map"] = np.clip(map_values.astype(np.float32), a_min=0, a_max=None)
-    df["ci_50_low"] = np.clip(quantiles[0].astype(np.float32), a_min=0, a_max=None)
-    df["ci_50_high"] = quantiles[1].astype(np.float32)
-    df["ci_99_low"] = np.clip(quantiles[2].astype(np.float32), a_min=0, a_max=None)
-    df["ci_99_high"] = quantiles[3].astype(np.float32)
-
-    df["ci_90_low"] = np.clip(
-        np.expm1(df["pred_ln_sb_best_hdi_lower"].astype(np.float32)), a_min=0, a_max=None
-    )
-    df["ci_90_high"] = np.expm1(df["pred_ln_sb_best_hdi_upper"].astype(np.float32)).astype(
-        np.float32
+    intervals = compute_intervals(
+        quantiles,
+        df["pred_ln_sb_best_hdi_lower"].to_numpy(dtype=np.float32),
+        df["pred_ln_sb_best_hdi_upper"].to_numpy(dtype=np.float32),
     )
+    for col, values in intervals.items():
+        df[col] = values
 
     for threshold, probs in threshold_probs.items():
         col = f"prob_{threshold}"
@@ -221,34 +548,96 @@ def prepare_forecast_dataframe(preds_path: Path, hdi_path: Path) -> pd.DataFrame
     df["grid_id"] = df["priogrid_id"].astype(np.int32)
     df["latitude"] = df["lat"].astype(np.float32)
     df["longitude"] = df["lon"].astype(np.float32)
-    df["country_id"] = df["country_id"].astype(np.int32).astype(str).str.zfill(3)
-    df["admin_1_id"] = None
-    df["admin_2_id"] = None
+    df["country_id"] = format_country_codes(df["country_id"].to_numpy())
+    df["admin_1_id"] = pd.Series(pd.NA, index=df.index, dtype="string")
+    df["admin_2_id"] = pd.Series(pd.NA, index=df.index, dtype="string")
     df["month"] = month_id_to_month(df["month_id"].to_numpy())
 
-    float_cols = [
-        "map",
-        "ci_50_low",
-        "ci_50_high",
-        "ci_90_low",
-        "ci_90_high",
-        "ci_99_low",
-        "ci_99_high",
-        "prob_0",
-        "prob_1",
-        "prob_10",
-        "prob_100",
-        "prob_1000",
-        "prob_10000",
-    ]
-    for col in float_cols:
-        df[col] = df[col].astype(np.float32)
-
-    result = df[FORECAST_COLUMNS].sort_values(["month", "grid_id"]).reset_index(drop=True)
-    FORECAST_SCHEMA.validate(result, lazy=True)
+    # Assemble from the existing columns; df[FORECAST_COLUMNS] would copy them all.
+    result = pd.DataFrame({col: df[col] for col in FORECAST_COLUMNS}, copy=False)
+    if validate:
+        FORECAST_SCHEMA.validate(result, lazy=True)
     return result
 
 
+def compact_forecast_table(table: pa.Table) -> pa.Table:
+    """Quantise forecast values for the ``--compact`` output.
+
+    ``prob_*`` columns become uint8 with ``{"scale": "1/255"}`` field
+    metadata (multiply by the scale to recover the probability, absolute
+    error at most 1/510); ``map`` and ``ci_*`` columns become float16.
+
+    Args:
+        table: Forecast table in the API schema.
+
+    Returns:
+        Table with the quantised columns in place of the float32 ones.
+    """
+    columns = []
+    fields = []
+    for field, column in zip(table.schema, table.columns):
+        if field.name.startswith("prob_"):
+            probs = column.to_numpy()
+            steps = np.rint(np.clip(probs, 0, 1) * PROBABILITY_SCALE).astype(np.uint8)
+            column = pa.array(steps)
+            field = pa.field(field.name, pa.uint8(), metadata={"scale": f"1/{PROBABILITY_SCALE}"})
+        elif field.name.startswith(COMPACT_FLOAT_PREFIXES):
+            column = pa.array(column.to_numpy().astype(np.float16))
+            field = field.with_type(pa.float16())
+        columns.append(column)
+        fields.append(field)
+    return pa.Table.from_arrays(columns, schema=pa.schema(fields))
+
+
+def write_forecast_parquet(df: pd.DataFrame, output_path: Path, compact: bool = False) -> None:
+    """Write month-sorted forecasts with one row group per month.
+
+    A ``ParquetWriter`` receives one month slice at a time, so only a single
+    month is held as an Arrow table while writing. The file is written next
+    to ``output_path`` and moved into place only once complete, so a failure
+    never leaves a truncated parquet for the loader to serve.
+
+    Args:
+        df: Forecast DataFrame sorted by month.
+        output_path: Path where the parquet file will be written.
+        compact: Quantise values with ``compact_forecast_table`` before writing.
+    """
+    temp_path = output_path.with_suffix(".tmp")
+    try:
+        _write_month_row_groups(df, temp_path, compact)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_month_row_groups(df: pd.DataFrame, output_path: Path, compact: bool) -> None:
+    if df.empty:
+        table = pa.Table.from_pandas(df, schema=OUTPUT_SCHEMA, preserve_index=False)
+        pq.write_table(compact_forecast_table(table) if compact else table, output_path)
+        return
+
+    months = df["month"].to_numpy()
+    boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+    starts = np.concatenate([[0], boundaries])
+    stops = np.concatenate([boundaries, [len(df)]])
+
+    writer = None
+    try:
+        for start, stop in zip(starts, stops):
+            table = pa.Table.from_pandas(
+                df.iloc[start:stop], schema=OUTPUT_SCHEMA, preserve_index=False
+            )
+            if compact:
+                table = compact_forecast_table(table)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema, compression="zstd")
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
 def main() -> None:
     """Entry point for forecast preparation script.
 
@@ -260,10 +649,12 @@ def main() -> None:
         raise FileExistsError(f"{args.output} already exists. Use --overwrite to replace it.")
 
     logger.info("Preparing forecasts from %s and %s", args.preds_parquet, args.hdi_parquet)
-    forecast_df = prepare_forecast_dataframe(args.preds_parquet, args.hdi_parquet)
+    forecast_df = prepare_forecast_dataframe(
+        args.preds_parquet, args.hdi_parquet, validate=args.validate
+    )
 
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    forecast_df.to_parquet(args.output, index=False)
+    write_forecast_parquet(forecast_df, args.output, compact=args.compact)
     logger.info("Wrote %s (%d rows)", args.output, len(forecast_df))
 
 
@@ -0,0 +1,165 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import scripts.import_views as import_views
+from scripts.import_views import (
+    FORECAST_COLUMNS,
+    build_month_lookup,
+    convert_country_month,
+    convert_priogrid,
+    load_country_centroids,
+    load_priogrid_lookup,
+    lookup_month_names,
+    read_csv_cached,
+)
+
+
+@pytest.fixture()
+def raw_dir(tmp_path):
+    codebook = {"months": [{"id": 529, "name": "2024-01"}, {"id": 530, "name": "2024-02"}]}
+    (tmp_path / "codebook.json").write_text(json.dumps(codebook), encoding="utf-8")
+
+    pd.DataFrame(
+        {
+            "pg_id": [1001, 1002],
+            "lat": [1.25, -2.75],
+            "lon": [34.25, 40.75],
+            "iso3": ["800", "404"],
+            "unused": ["a", "b"],
+        }
+    ).to_csv(tmp_path / "priogrid.csv", index=False)
+
+    pd.DataFrame(
+        {
+            "pg_id": [1001, 1002, 1001],
+            "month_id": [529, 529, 530],
+            "main_mean": [12.0, None, 4.0],
+            "main_dich": [0.8, 0.2, 1.4],
+            "unused": [1, 2, 3],
+        }
+    ).to_csv(tmp_path / "fatalities_t01_pgm.csv", index=False)
+
+    pd.DataFrame({"iso3": ["800", "404"], "lat": [1.0, -1.0], "lon": [32.0, 38.0]}).to_csv(
+        tmp_path / "centroids.csv", index=False
+    )
+
+    pd.DataFrame(
+        {
+            "isoab": ["800", "404", "800"],
+            "year": [2024, 2024, 2024],
+            "month": [1, 1, 2],
+            "month_id": [529, 529, 530],
+            "main_mean": [100.0, 50.0, 80.0],
+            "main_dich": [0.9, 0.5, 0.7],
+        }
+    ).to_csv(tmp_path / "fatalities_t01_cm.csv", index=False)
+
+    return tmp_path
+
+
+def test_convert_priogrid(raw_dir, tmp_path):
+    month_lookup = build_month_lookup(raw_dir / "codebook.json")
+    lookup = load_priogrid_lookup(raw_dir / "priogrid.csv")
+    output = tmp_path / "out" / "fatalities_pgm.parquet"
+
+    convert_priogrid(raw_dir / "fatalities_t01_pgm.csv", output, month_lookup, lookup, False)
+    result = pd.read_parquet(output)
+
+    assert list(result.columns) == FORECAST_COLUMNS
+    assert result["grid_id"].tolist() == [1001, 1002, 1001]
+    assert result["month"].tolist() == ["2024-01", "2024-01", "2024-02"]
+    assert result["country_id"].tolist() == ["800", "404", "800"]
+    np.testing.assert_allclose(result["latitude"], [1.25, -2.75, 1.25])
+    np.testing.assert_allclose(result["map"], [12.0, 0.0, 4.0])
+    np.testing.assert_allclose(result["prob_1"], [0.8, 0.2, 1.0])
+    np.testing.assert_allclose(result["prob_0"], [0.2, 0.8, 0.0], atol=1e-9)
+    np.testing.assert_allclose(result["ci_90_high"], [18.0, 0.0, 6.0])
+    assert isinstance(result["country_id"].dtype, pd.CategoricalDtype)
+    metadata = pq.ParquetFile(output).metadata
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+    with pytest.raises(FileExistsError):
+        convert_priogrid(raw_dir / "fatalities_t01_pgm.csv", output, month_lookup, lookup, False)
+
+
+def test_load_priogrid_lookup_reads_byte_order_marked_csv(raw_dir):
+    plain = load_priogrid_lookup(raw_dir / "priogrid.csv")
+    text = (raw_dir / "priogrid.csv").read_text(encoding="utf-8")
+    (raw_dir / "priogrid.csv").write_text(text, encoding="utf-8-sig")
+
+    pd.testing.assert_frame_equal(load_priogrid_lookup(raw_dir / "priogrid.csv"), plain)
+
+
+def test_convert_priogrid_reuses_csv_cache(raw_dir, tmp_path, monkeypatch):
+    month_lookup = build_month_lookup(raw_dir / "codebook.json")
+    lookup = load_priogrid_lookup(raw_dir / "priogrid.csv")
+    csv_path = raw_dir / "fatalities_t01_pgm.csv"
+    output = tmp_path / "out" / "fatalities_pgm.parquet"
+
+    convert_priogrid(csv_path, output, month_lookup, lookup, False)
+    cache_path = raw_dir / "fatalities_t01_pgm.cache.parquet"
+    assert cache_path.exists()
+    assert "unused" not in pd.read_parquet(cache_path).columns
+
+    # An unchanged CSV is served from the cache without being parsed again.
+    def fail_read(*args):
+        raise AssertionError("CSV was parsed despite an up-to-date cache")
+
+    monkeypatch.setattr(import_views, "_read_csv_table", fail_read)
+    convert_priogrid(csv_path, output, month_lookup, lookup, True)
+    assert len(pd.read_parquet(output)) == 3
+    monkeypatch.undo()
+
+    # A CSV replaced with an older timestamp, or a different projection, is re-read.
+    stat = csv_path.stat()
+    csv_path.write_text("pg_id,month_id,main_mean,main_dich\n", encoding="utf-8")
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+    with pytest.raises(ValueError, match="no rows"):
+        convert_priogrid(csv_path, output, month_lookup, lookup, True)
+    assert read_csv_cached(csv_path, ["pg_id"]).column_names == ["pg_id"]
+
+
+def test_convert_country_month(raw_dir, tmp_path):
+    month_lookup = build_month_lookup(raw_dir / "codebook.json")
+    centroids = load_country_centroids(raw_dir / "centroids.csv")
+    output = tmp_path / "out" / "fatalities_cm.parquet"
+
+    convert_country_month(raw_dir / "fatalities_t01_cm.csv", output, month_lookup, centroids, False)
+    result = pd.read_parquet(output)
+
+    assert list(result.columns) == FORECAST_COLUMNS
+    assert result["country_id"].tolist() == ["404", "800", "800"]
+    assert result["month"].tolist() == ["2024-01", "2024-01", "2024-02"]
+    assert result["grid_id"].tolist() == [10_000_000, 10_000_001, 10_000_001]
+    assert result["admin_1_id"].isna().all()
+    assert pq.read_schema(output).field("admin_1_id").type.value_type == "string"
+    np.testing.assert_allclose(result["map"], [50.0, 100.0, 80.0])
+
+
+def test_convert_priogrid_rejects_unknown_grid_cells(raw_dir, tmp_path):
+    month_lookup = build_month_lookup(raw_dir / "codebook.json")
+    lookup = load_priogrid_lookup(raw_dir / "priogrid.csv")
+    lookup = lookup.drop(index=1002)
+
+    with pytest.raises(ValueError, match="missing for 1 grid cells"):
+        convert_priogrid(
+            raw_dir / "fatalities_t01_pgm.csv",
+            tmp_path / "out.parquet",
+            month_lookup,
+            lookup,
+            False,
+        )
+
+
+def test_lookup_month_names_flags_unknown_ids(raw_dir):
+    month_lookup = build_month_lookup(raw_dir / "codebook.json")
+
+    names, unknown = lookup_month_names(pd.Series([530, 529, 7, 600, -1]), month_lookup)
+
+    assert names.tolist() == ["2024-02", "2024-01", None, None, None]
+    assert unknown.tolist() == [False, False, True, True, True]
@@ -0,0 +1,183 @@
+import sqlite3
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import scripts.load_parquet_to_db as load_parquet_to_db
+from app.services.sample_data import generate_sample_forecasts
+
+
+def test_main_streams_parquet_batches_into_sqlite(tmp_path, monkeypatch):
+    source = tmp_path / "parquet"
+    source.mkdir()
+    df = generate_sample_forecasts()
+    df.to_parquet(source / "forecasts.parquet", index=False)
+    db_path = tmp_path / "forecasts.db"
+
+    monkeypatch.setattr(load_parquet_to_db, "BATCH_ROWS", 7)
+    load_parquet_to_db.main(["--source", str(source), "--database-url", f"sqlite:///{db_path}"])
+    load_parquet_to_db.main(
+        ["--source", str(source), "--database-url", f"sqlite:///{db_path}", "--mode", "replace"]
+    )
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0] == len(df)
+        grid_ids = {row[0] for row in conn.execute("SELECT DISTINCT grid_id FROM forecasts")}
+    assert grid_ids == set(df["grid_id"].tolist())
+
+
+def test_iter_forecast_frames_projects_forecast_columns(tmp_path):
+    df = generate_sample_forecasts().head(5).copy()
+    df["unused"] = "x"
+    path = tmp_path / "forecasts.parquet"
+    df.to_parquet(path, index=False)
+
+    file_type, columns = load_parquet_to_db.classify_parquet_file(pq.ParquetFile(path))
+    frame = pd.concat(load_parquet_to_db.iter_forecast_frames([path]))
+
+    assert file_type == "api_ready"
+    assert "unused" not in columns
+    assert list(frame.columns) == columns
+
+
+def test_iter_forecast_frames_reads_repeated_paths_and_closes_handles(tmp_path, monkeypatch):
+    df = generate_sample_forecasts().head(5)
+    path = tmp_path / "forecasts.parquet"
+    df.to_parquet(path, index=False)
+
+    frames = list(load_parquet_to_db.iter_forecast_frames([path, path]))
+    assert sum(len(frame) for frame in frames) == 2 * len(df)
+
+    opened = []
+    original_group = load_parquet_to_db.group_parquet_files
+
+    def recording_group(files):
+        grouped = original_group(files)
+        opened.extend(grouped[1])
+        return grouped
+
+    monkeypatch.setattr(load_parquet_to_db, "group_parquet_files", recording_group)
+    stream = load_parquet_to_db.iter_forecast_frames([path, path])
+    next(stream)
+    stream.close()
+
+    assert len(opened) == 2
+    assert all(parquet_file.closed for parquet_file in opened)
+
+
+def test_normalize_forecast_frame_pads_country_codes():
+    df = pd.DataFrame({"country_id": [4, "12.0", " 800 ", None]})
+
+    result = load_parquet_to_db.normalize_forecast_frame(df)
+
+    assert result["country_id"].tolist() == ["004", "012", "800", None]
+    with pytest.raises(ValueError, match="ABC"):
+        load_parquet_to_db.normalize_forecast_frame(pd.DataFrame({"country_id": ["ABC", "1234"]}))
+
+
+def test_write_forecasts_rolls_back_failed_load(tmp_path):
+    df = generate_sample_forecasts()
+    good = tmp_path / "good.parquet"
+    df.to_parquet(good, index=False)
+    bad = tmp_path / "bad.parquet"
+    df.assign(country_id="ABC").to_parquet(bad, index=False)
+
+    with sqlite3.connect(tmp_path / "forecasts.db") as conn:
+        assert load_parquet_to_db.write_forecasts(conn, [good], "replace") == len(df)
+        with pytest.raises(ValueError):
+            load_parquet_to_db.write_forecasts(conn, [bad], "replace")
+        assert conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0] == len(df)
+
+
+def test_write_forecasts_rebuilds_indexes_after_append(tmp_path):
+    path = tmp_path / "forecasts.parquet"
+    generate_sample_forecasts().to_parquet(path, index=False)
+
+    with sqlite3.connect(tmp_path / "forecasts.db") as conn:
+        load_parquet_to_db.write_forecasts(conn, [path], "replace")
+        conn.execute("CREATE INDEX idx_forecasts_month ON forecasts(month)")
+        load_parquet_to_db.write_forecasts(conn, [path], "append")
+        indexes = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'forecasts'"
+            )
+        }
+
+    assert indexes == set(load_parquet_to_db.FORECAST_INDEXES)
+
+
+def read_forecast_frames(parquet_files):
+    return pd.concat(load_parquet_to_db.iter_forecast_frames(parquet_files), ignore_index=True)
+
+
+def test_iter_forecast_frames_scans_files_as_one_dataset(tmp_path, monkeypatch):
+    df = generate_sample_forecasts()
+    first, second = tmp_path / "a.parquet", tmp_path / "b.parquet"
+    # float32 and float64 map columns cannot be unified, which forces the
+    # per-file fallback for this pair.
+    df.iloc[:10].astype({"map": "float64"}).to_parquet(first, index=False)
+    df.iloc[10:].to_parquet(second, index=False)
+
+    scans = []
+    original_scan = load_parquet_to_db._scan_api_ready_files
+
+    def recording_scan(*args):
+        batches = original_scan(*args)
+        scans.append(batches is not None)
+        return batches
+
+    monkeypatch.setattr(load_parquet_to_db, "_scan_api_ready_files", recording_scan)
+    combined = read_forecast_frames([second, second])
+    fallback = read_forecast_frames([first, second])
+
+    assert scans == [True, False]
+    assert len(combined) == 2 * (len(df) - 10)
+    assert len(fallback) == len(df)
+    assert fallback["grid_id"].tolist() == df["grid_id"].tolist()
+
+
+def test_iter_forecast_frames_keeps_columns_missing_from_some_files(tmp_path):
+    df = generate_sample_forecasts()
+    with_admin, without_admin = tmp_path / "a.parquet", tmp_path / "b.parquet"
+    df.iloc[:10].to_parquet(with_admin, index=False)
+    df.iloc[10:].drop(columns=["admin_1_id", "admin_2_id"]).to_parquet(without_admin, index=False)
+
+    for files in ([with_admin, without_admin], [without_admin, with_admin]):
+        result = read_forecast_frames(files)
+
+        assert set(result.columns) == set(df.columns)
+        assert result["admin_1_id"].notna().sum() == df["admin_1_id"].iloc[:10].notna().sum()
+        assert len(result) == len(df)
+
+
+def test_validate_forecast_chunk_checks_every_row():
+    df = generate_sample_forecasts()
+
+    validated = load_parquet_to_db.validate_forecast_chunk(df.copy())
+    assert list(validated.columns) == load_parquet_to_db.FORECAST_COLUMNS
+    assert validated["grid_id"].dtype == "int32"
+
+    out_of_range = df.copy()
+    out_of_range.loc[len(df) - 1, "prob_10"] = 1.5
+    with pytest.raises(ValueError, match="prob_10"):
+        load_parquet_to_db.validate_forecast_chunk(out_of_range)
+
+    missing = df.copy()
+    missing.loc[len(df) - 1, "map"] = None
+    with pytest.raises(ValueError, match="map"):
+        load_parquet_to_db.validate_forecast_chunk(missing)
+
+
+def test_s3_local_path_keeps_keys_with_shared_basenames_apart(tmp_path):
+    keys = ["views/2025/07/forecasts.parquet", "views/2025/08/forecasts.parquet"]
+
+    paths = [load_parquet_to_db.s3_local_path(tmp_path, key, "views/") for key in keys]
+
+    assert paths == [
+        tmp_path / "2025" / "07" / "forecasts.parquet",
+        tmp_path / "2025" / "08" / "forecasts.parquet",
+    ]
+    with pytest.raises(SystemExit, match="outside"):
+        load_parquet_to_db.s3_local_path(tmp_path, "views/../../etc/passwd", "views/")
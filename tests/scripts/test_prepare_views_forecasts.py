@@ -1,10 +1,19 @@
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
+import scripts.prepare_views_forecasts as prepare_views_forecasts
 from scripts.prepare_views_forecasts import (
     FORECAST_COLUMNS,
+    OUTPUT_SCHEMA,
+    draws_matrix,
+    format_country_codes,
+    join_hdi_bounds,
+    month_id_to_month,
     prepare_forecast_dataframe,
+    write_forecast_parquet,
 )
 
 
@@ -73,6 +82,8 @@ def test_prepare_forecast_dataframe(sample_pred_paths):
     assert result.shape == (2, len(FORECAST_COLUMNS))
     assert result["month"].tolist() == ["2024-01", "2024-02"]
     assert result["country_id"].tolist() == ["007", "840"]
+    assert result["admin_1_id"].dtype == "string"
+    assert result["admin_2_id"].isna().all()
 
     float_cols = [
         "latitude",
@@ -103,3 +114,147 @@ def test_prepare_forecast_dataframe(sample_pred_paths):
     np.testing.assert_allclose(result.loc[1, "ci_90_low"], lower_two, rtol=1e-6)
     np.testing.assert_allclose(result.loc[1, "ci_90_high"], upper_two, rtol=1e-6)
     np.testing.assert_allclose(result["prob_0"], 1.0 - result["prob_1"], rtol=1e-6)
+
+
+def test_prepare_forecast_dataframe_aligns_draws_with_shuffled_hdi(sample_pred_paths, tmp_path):
+    preds_path, hdi_path = sample_pred_paths[:2]
+    shuffled_hdi_path = tmp_path / "hdi_shuffled.parquet"
+    pd.read_parquet(hdi_path).iloc[::-1].to_parquet(shuffled_hdi_path)
+
+    expected = prepare_forecast_dataframe(preds_path, hdi_path)
+    result = prepare_forecast_dataframe(preds_path, shuffled_hdi_path)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_prepare_forecast_dataframe_orders_unsorted_preds(sample_pred_paths, tmp_path):
+    preds_path, hdi_path = sample_pred_paths[:2]
+    reversed_preds_path = tmp_path / "preds_reversed.parquet"
+    pd.read_parquet(preds_path).iloc[::-1].to_parquet(reversed_preds_path)
+
+    expected = prepare_forecast_dataframe(preds_path, hdi_path)
+    result = prepare_forecast_dataframe(reversed_preds_path, hdi_path)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_prepare_forecast_dataframe_reports_missing_hdi(sample_pred_paths, tmp_path):
+    preds_path, hdi_path = sample_pred_paths[:2]
+    partial_hdi_path = tmp_path / "hdi_partial.parquet"
+    pd.read_parquet(hdi_path).iloc[:1].to_parquet(partial_hdi_path)
+
+    with pytest.raises(ValueError, match=r"for 1 grid cells: \(410, 1002\)$"):
+        prepare_forecast_dataframe(preds_path, partial_hdi_path)
+
+
+def test_join_hdi_bounds_marks_missing_and_rejects_duplicates():
+    preds = pd.DataFrame({"month_id": [2, 1, 1], "priogrid_id": [10, 10, 11]})
+    hdi = pd.DataFrame(
+        {
+            "month_id": [1, 2],
+            "priogrid_id": [10, 10],
+            "pred_ln_sb_best_hdi_lower": [0.1, 0.2],
+            "pred_ln_sb_best_hdi_upper": [1.1, 1.2],
+        }
+    )
+
+    lower, upper = join_hdi_bounds(preds, hdi)
+
+    np.testing.assert_array_equal(lower, [0.2, 0.1, np.nan])
+    np.testing.assert_array_equal(upper, [1.2, 1.1, np.nan])
+    with pytest.raises(ValueError, match="duplicate"):
+        join_hdi_bounds(preds, pd.concat([hdi, hdi]))
+    with pytest.raises(ValueError, match="priogrid_id has 1 missing"):
+        join_hdi_bounds(preds.astype(float).replace(11, np.nan), hdi)
+
+
+def test_format_country_codes():
+    assert format_country_codes(np.array([4, 840, 0])).tolist() == ["004", "840", "000"]
+    with pytest.raises(ValueError, match="1000"):
+        format_country_codes(np.array([4, 1000]))
+    with pytest.raises(ValueError, match="country_id has 1 missing"):
+        format_country_codes(np.array([4.0, np.nan]))
+
+
+def test_month_id_to_month():
+    assert month_id_to_month([1, 12, 13, 529]).tolist() == [
+        "1990-01",
+        "1990-12",
+        "1991-01",
+        "2034-01",
+    ]
+    assert month_id_to_month([5000]).tolist() == ["2406-08"]
+    assert month_id_to_month([1024, 1025, 2**31, 1025]).tolist() == [
+        "2075-04",
+        "2075-05",
+        "178958960-08",
+        "2075-05",
+    ]
+    assert len(prepare_views_forecasts._month_lut()) == prepare_views_forecasts.MONTH_LUT_SIZE
+    with pytest.raises(ValueError, match="month_id"):
+        month_id_to_month([0])
+    with pytest.raises(ValueError, match="month_id has 1 missing"):
+        month_id_to_month([1.0, np.nan])
+
+
+def test_draws_matrix_reads_list_chunks():
+    column = pa.chunked_array([[[0.0, 1.0], [2.0, 3.0]], [[4.0, 5.0]]], type=pa.list_(pa.float32()))
+
+    draws = draws_matrix(column)
+
+    assert draws.dtype == np.float32
+    np.testing.assert_array_equal(draws, [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]])
+    with pytest.raises(ValueError, match="same number"):
+        draws_matrix(pa.chunked_array([[[0.0, 1.0], [2.0]]]))
+    with pytest.raises(ValueError, match="array-like"):
+        draws_matrix(pa.chunked_array([[0.0, 1.0]]))
+
+
+def test_write_forecast_parquet_writes_a_row_group_per_month(sample_pred_paths, tmp_path):
+    result = prepare_forecast_dataframe(*sample_pred_paths[:2])
+    output = tmp_path / "forecasts.parquet"
+
+    write_forecast_parquet(result, output)
+
+    assert pq.ParquetFile(output).metadata.num_row_groups == result["month"].nunique()
+    assert pq.read_schema(output).remove_metadata() == OUTPUT_SCHEMA
+    pd.testing.assert_frame_equal(pd.read_parquet(output), result)
+
+
+def test_write_forecast_parquet_keeps_previous_file_on_failure(sample_pred_paths, tmp_path):
+    result = prepare_forecast_dataframe(*sample_pred_paths[:2])
+    output = tmp_path / "forecasts.parquet"
+    write_forecast_parquet(result, output)
+
+    # The last month cannot be converted, after earlier months were written.
+    broken = result.astype({"map": object})
+    broken.loc[broken["month"] == broken["month"].iloc[-1], "map"] = "not a number"
+    with pytest.raises((pa.ArrowException, TypeError, ValueError)):
+        write_forecast_parquet(broken, output)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(output), result)
+    assert sorted(path.name for path in tmp_path.glob("forecasts.*")) == ["forecasts.parquet"]
+
+
+def test_write_forecast_parquet_compact_quantises_values(sample_pred_paths, tmp_path):
+    result = prepare_forecast_dataframe(*sample_pred_paths[:2])
+    output = tmp_path / "forecasts_compact.parquet"
+
+    write_forecast_parquet(result, output, compact=True)
+
+    schema = pq.read_schema(output)
+    assert schema.field("prob_10").type == pa.uint8()
+    assert schema.field("prob_10").metadata == {b"scale": b"1/255"}
+    assert schema.field("ci_90_low").type == pa.float16()
+    assert schema.field("map").type == pa.float16()
+    compact = pd.read_parquet(output)
+    np.testing.assert_allclose(compact["prob_10"] / 255, result["prob_10"], atol=1 / 510)
+    np.testing.assert_allclose(compact["map"], result["map"], rtol=1e-3)
+
+
+def test_prepare_forecast_dataframe_strict_validation_matches(sample_pred_paths):
+    preds_path, hdi_path = sample_pred_paths[:2]
+
+    validated = prepare_forecast_dataframe(preds_path, hdi_path, validate=True)
+
+    pd.testing.assert_frame_equal(validated, prepare_forecast_dataframe(preds_path, hdi_path))
@@ -1,7 +1,11 @@
+import pytest
 from fastapi.testclient import TestClient
 
 from app.api.dependencies import verify_api_key
+from app.core.config import settings
+from app.di import get_forecast_repository
 from app.main import app
+from app.services.data_loader import DataLoader
 
 COUNTRY_CODE = "800"
 
@@ -11,6 +15,21 @@ client = TestClient(app)
 app.dependency_overrides[verify_api_key] = lambda: True
 
 
+@pytest.fixture(scope="module", autouse=True)
+def isolated_repository(tmp_path_factory):
+    """Serve sample data from a per-worker directory rather than the shared ./data.
+
+    The loader gets its own settings copy, so nothing global is patched and
+    pytest-xdist workers never generate sample data into the same path.
+    """
+    data_path = tmp_path_factory.mktemp("api_data")
+    loader_settings = settings.model_copy(update={"data_path": str(data_path)})
+    repository = DataLoader(backend="parquet", settings=loader_settings)
+    app.dependency_overrides[get_forecast_repository] = lambda: repository
+    yield repository
+    app.dependency_overrides.pop(get_forecast_repository, None)
+
+
 def test_health_check():
     """Test health check endpoint"""
     response = client.get("/health")
@@ -1,33 +1,39 @@
-import asyncio
+import json
 
+import pytest
+from fastapi import FastAPI
 from starlette.testclient import TestClient
 
 from app.main import app, lifespan
 
+BOOM_PATH = "/_test_boom_internal"
 
-def test_global_exception_handler():
-    client = TestClient(app, raise_server_exceptions=False)
 
-    @app.get("/boom")
-    async def boom():  # type: ignore
+@pytest.fixture(scope="module")
+def boom_client():
+    """Client for a throwaway app sharing the real exception handlers.
+
+    Keeps the failing test route off the shared ``app`` used by other modules.
+    """
+    boom_app = FastAPI(exception_handlers=app.exception_handlers)
+
+    @boom_app.get(BOOM_PATH)
+    async def _boom():
         raise RuntimeError("Boom")
 
-    try:
-        response = client.get("/boom")
-        assert response.status_code == 500
-        payload = response.json()
-        assert payload["error"] == "Internal server error"
-    finally:
-        app.router.routes = [
-            route for route in app.router.routes if getattr(route, "path", None) != "/boom"
-        ]
+    with TestClient(boom_app, raise_server_exceptions=False) as test_client:
+        yield test_client
+
 
+def test_global_exception_handler(boom_client):
+    response = boom_client.get(BOOM_PATH)
+    assert response.status_code == 500
+    assert json.loads(response.content)["error"] == "Internal server error"
 
-def test_lifespan_logs(caplog):
-    async def run_lifespan():
-        async with lifespan(app):
-            pass
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_lifespan_logs(caplog):
     caplog.set_level("INFO")
-    asyncio.run(run_lifespan())
+    async with lifespan(app):
+        pass
     assert any("Starting" in record.message for record in caplog.records)
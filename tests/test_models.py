@@ -10,28 +10,45 @@ from app.models.forecast import (
     MetricName,
 )
 
-
-def test_forecast_metrics_validation():
+_VALID_METRICS_KWARGS = {
+    "map": 10.5,
+    "ci_50_low": 7.0,
+    "ci_50_high": 14.0,
+    "ci_90_low": 4.0,
+    "ci_90_high": 20.0,
+    "ci_99_low": 1.0,
+    "ci_99_high": 30.0,
+    "prob_0": 0.1,
+    "prob_1": 0.3,
+    "prob_10": 0.2,
+    "prob_100": 0.1,
+    "prob_1000": 0.05,
+    "prob_10000": 0.01,
+}
+
+
+@pytest.mark.parametrize(
+    ("override", "valid"),
+    [
+        ({}, True),
+        ({"ci_50_low": 14.0, "ci_50_high": 7.0}, False),  # CI high < CI low
+        ({"prob_0": 1.5}, False),  # Probability > 1
+    ],
+)
+def test_forecast_metrics_validation(override, valid):
     """Test ForecastMetrics model validation"""
-    # Valid metrics
-    metrics = ForecastMetrics(
-        map=10.5,
-        ci_50_low=7.0,
-        ci_50_high=14.0,
-        ci_90_low=4.0,
-        ci_90_high=20.0,
-        ci_99_low=1.0,
-        ci_99_high=30.0,
-        prob_0=0.1,
-        prob_1=0.3,
-        prob_10=0.2,
-        prob_100=0.1,
-        prob_1000=0.05,
-        prob_10000=0.01,
-    )
+    kwargs = {**_VALID_METRICS_KWARGS, **override}
+    if not valid:
+        with pytest.raises(ValidationError):
+            ForecastMetrics(**kwargs)
+        return
+
+    metrics = ForecastMetrics(**kwargs)
     assert metrics.map == 10.5
     assert metrics.ci_50_low < metrics.ci_50_high
 
+
+def test_forecast_metrics_requires_at_least_one_metric():
     # Valid when only a subset of metrics is provided
     partial_metrics = ForecastMetrics(map=5.0, prob_1=0.25)
     assert partial_metrics.model_dump() == {"map": 5.0, "prob_1": 0.25}
@@ -40,42 +57,6 @@ def test_forecast_metrics_validation():
     with pytest.raises(ValidationError):
         ForecastMetrics()
 
-    # Invalid: CI high < CI low
-    with pytest.raises(ValidationError):
-        ForecastMetrics(
-            map=10.5,
-            ci_50_low=14.0,
-            ci_50_high=7.0,  # Invalid: lower than ci_50_low
-            ci_90_low=4.0,
-            ci_90_high=20.0,
-            ci_99_low=1.0,
-            ci_99_high=30.0,
-            prob_0=0.1,
-            prob_1=0.3,
-            prob_10=0.2,
-            prob_100=0.1,
-            prob_1000=0.05,
-            prob_10000=0.01,
-        )
-
-    # Invalid: Probability > 1
-    with pytest.raises(ValidationError):
-        ForecastMetrics(
-            map=10.5,
-            ci_50_low=7.0,
-            ci_50_high=14.0,
-            ci_90_low=4.0,
-            ci_90_high=20.0,
-            ci_99_low=1.0,
-            ci_99_high=30.0,
-            prob_0=1.5,  # Invalid: > 1
-            prob_1=0.3,
-            prob_10=0.2,
-            prob_100=0.1,
-            prob_1000=0.05,
-            prob_10000=0.01,
-        )
-
 
 def test_grid_cell_forecast():
     """Test GridCellForecast model"""
@@ -85,21 +66,9 @@ def test_grid_cell_forecast():
         longitude=32.5,
         country_id="800",
         month="2024-01",
-        metrics=ForecastMetrics(
-            map=10.5,
-            ci_50_low=7.0,
-            ci_50_high=14.0,
-            ci_90_low=4.0,
-            ci_90_high=20.0,
-            ci_99_low=1.0,
-            ci_99_high=30.0,
-            prob_0=0.1,
-            prob_1=0.3,
-            prob_10=0.2,
-            prob_100=0.1,
-            prob_1000=0.05,
-            prob_10000=0.01,
-        ),
+        # The metrics are not under test here, so skip their validation;
+        # test_forecast_metrics_validation keeps exercising the validators.
+        metrics=ForecastMetrics.model_construct(**_VALID_METRICS_KWARGS),
     )
     assert forecast.grid_id == 1
     assert forecast.country_id == "800"
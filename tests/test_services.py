@@ -1,140 +1,273 @@
+import shutil
+from functools import lru_cache
+from typing import List
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
+from pydantic import TypeAdapter
 
 from app.core.config import settings
-from app.models.forecast import ForecastQuery, MetricName
+from app.models.forecast import ForecastQuery, GridCellForecast, MetricName
+from app.services import data_loader
 from app.services.data_loader import DataLoader
 from app.services.forecast_service import ForecastService
-from app.services.sample_data import FORECAST_COLUMNS
 
+METRIC_COLUMNS = [
+    "map",
+    "ci_50_low",
+    "ci_50_high",
+    "ci_90_low",
+    "ci_90_high",
+    "ci_99_low",
+    "ci_99_high",
+    "prob_0",
+    "prob_1",
+    "prob_10",
+    "prob_100",
+    "prob_1000",
+    "prob_10000",
+]
 
-@pytest.fixture()
-def repository(tmp_path, monkeypatch):
-    monkeypatch.setattr(settings, "data_path", str(tmp_path), raising=False)
-    data = [
-        {
-            "grid_id": 1,
-            "latitude": 11.1,
-            "longitude": 14.4,
-            "country_id": "074",
-            "admin_1_id": "074-ADM1-00",
-            "admin_2_id": "074-ADM2-00",
-            "month": "2024-01",
-            "map": 60.0,
-            "ci_50_low": 45.0,
-            "ci_50_high": 75.0,
-            "ci_90_low": 30.0,
-            "ci_90_high": 90.0,
-            "ci_99_low": 25.0,
-            "ci_99_high": 105.0,
-            "prob_0": 0.1,
-            "prob_1": 0.9,
-            "prob_10": 0.5,
-            "prob_100": 0.2,
-            "prob_1000": 0.15,
-            "prob_10000": 0.05,
-        },
-        {
-            "grid_id": 1,
-            "latitude": 11.1,
-            "longitude": 14.4,
-            "country_id": "074",
-            "admin_1_id": "074-ADM1-00",
-            "admin_2_id": "074-ADM2-00",
-            "month": "2024-02",
-            "map": 40.0,
-            "ci_50_low": 30.0,
-            "ci_50_high": 50.0,
-            "ci_90_low": 20.0,
-            "ci_90_high": 60.0,
-            "ci_99_low": 15.0,
-            "ci_99_high": 70.0,
-            "prob_0": 0.2,
-            "prob_1": 0.8,
-            "prob_10": 0.3,
-            "prob_100": 0.1,
-            "prob_1000": 0.05,
-            "prob_10000": 0.01,
-        },
-        {
-            "grid_id": 2,
-            "latitude": -1.2,
-            "longitude": 32.5,
-            "country_id": "800",
-            "admin_1_id": "800-ADM1-00",
-            "admin_2_id": "800-ADM2-00",
-            "month": "2024-01",
-            "map": 15.0,
-            "ci_50_low": 10.0,
-            "ci_50_high": 20.0,
-            "ci_90_low": 5.0,
-            "ci_90_high": 25.0,
-            "ci_99_low": 2.0,
-            "ci_99_high": 30.0,
-            "prob_0": 0.4,
-            "prob_1": 0.6,
-            "prob_10": 0.2,
-            "prob_100": 0.05,
-            "prob_1000": 0.01,
-            "prob_10000": 0.0,
-        },
+SCHEMA = pa.schema(
+    [
+        ("grid_id", pa.int32()),
+        ("latitude", pa.float32()),
+        ("longitude", pa.float32()),
+        ("country_id", pa.string()),
+        ("admin_1_id", pa.string()),
+        ("admin_2_id", pa.string()),
+        ("month", pa.string()),
     ]
+    + [(name, pa.float32()) for name in METRIC_COLUMNS]
+)
+
+
+FORECAST_ROWS = [
+    {
+        "grid_id": 1,
+        "latitude": 11.1,
+        "longitude": 14.4,
+        "country_id": "074",
+        "admin_1_id": "074-ADM1-00",
+        "admin_2_id": "074-ADM2-00",
+        "month": "2024-01",
+        "map": 60.0,
+        "ci_50_low": 45.0,
+        "ci_50_high": 75.0,
+        "ci_90_low": 30.0,
+        "ci_90_high": 90.0,
+        "ci_99_low": 25.0,
+        "ci_99_high": 105.0,
+        "prob_0": 0.1,
+        "prob_1": 0.9,
+        "prob_10": 0.5,
+        "prob_100": 0.2,
+        "prob_1000": 0.15,
+        "prob_10000": 0.05,
+    },
+    {
+        "grid_id": 1,
+        "latitude": 11.1,
+        "longitude": 14.4,
+        "country_id": "074",
+        "admin_1_id": "074-ADM1-00",
+        "admin_2_id": "074-ADM2-00",
+        "month": "2024-02",
+        "map": 40.0,
+        "ci_50_low": 30.0,
+        "ci_50_high": 50.0,
+        "ci_90_low": 20.0,
+        "ci_90_high": 60.0,
+        "ci_99_low": 15.0,
+        "ci_99_high": 70.0,
+        "prob_0": 0.2,
+        "prob_1": 0.8,
+        "prob_10": 0.3,
+        "prob_100": 0.1,
+        "prob_1000": 0.05,
+        "prob_10000": 0.01,
+    },
+    {
+        "grid_id": 2,
+        "latitude": -1.2,
+        "longitude": 32.5,
+        "country_id": "800",
+        "admin_1_id": "800-ADM1-00",
+        "admin_2_id": "800-ADM2-00",
+        "month": "2024-01",
+        "map": 15.0,
+        "ci_50_low": 10.0,
+        "ci_50_high": 20.0,
+        "ci_90_low": 5.0,
+        "ci_90_high": 25.0,
+        "ci_99_low": 2.0,
+        "ci_99_high": 30.0,
+        "prob_0": 0.4,
+        "prob_1": 0.6,
+        "prob_10": 0.2,
+        "prob_100": 0.05,
+        "prob_1000": 0.01,
+        "prob_10000": 0.0,
+    },
+]
+
+# Built once at import; the session fixture only has to encode it.
+FORECAST_TABLE = pa.Table.from_pylist(FORECAST_ROWS, schema=SCHEMA)
+
+
+# Validates or dumps a whole list of forecasts in one pydantic-core call.
+FORECAST_LIST = TypeAdapter(List[GridCellForecast])
+
+
+@lru_cache(maxsize=64)
+def _cached_query(key):
+    return ForecastQuery(
+        **{name: list(value) if isinstance(value, tuple) else value for name, value in key}
+    )
+
+
+def make_query(**kwargs):
+    """Return a fresh copy of the validated ForecastQuery for these arguments.
+
+    Validation runs once per distinct set of arguments; each caller gets its
+    own deep copy, so a mutated query cannot leak into other tests.
+    """
+    key = tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in kwargs.items()
+        )
+    )
+    return _cached_query(key).model_copy(deep=True)
+
+
+@pytest.fixture(scope="session")
+def _canonical_parquet_path(tmp_path_factory):
+    """Write the shared three-row forecasts parquet once per session."""
+    parquet_path = tmp_path_factory.mktemp("forecasts_canonical") / "forecasts.parquet"
+    pq.write_table(
+        FORECAST_TABLE,
+        parquet_path,
+        compression=None,
+        use_dictionary=["country_id", "admin_1_id", "admin_2_id", "month"],
+    )
+    return parquet_path
+
 
-    df = pd.DataFrame(data, columns=FORECAST_COLUMNS)
-    parquet_path = tmp_path / "forecasts.parquet"
-    df.to_parquet(parquet_path, index=False)
+def parquet_loader(data_path):
+    """Parquet DataLoader over ``data_path`` with its own copy of the settings."""
+    loader_settings = settings.model_copy(update={"data_path": str(data_path)})
+    return DataLoader(backend="parquet", settings=loader_settings)
 
-    return DataLoader(data_path=str(tmp_path), backend="parquet")
+
+@pytest.fixture(scope="module")
+def sample_repository(tmp_path_factory):
+    """Loader that generated the sample dataset into an empty directory, built once."""
+    return parquet_loader(tmp_path_factory.mktemp("sample_data"))
 
 
 @pytest.fixture()
-def service(repository):
-    return ForecastService(repository)
+def repository(_canonical_parquet_path, tmp_path):
+    # Tests may rewrite the file, so each one gets its own copy.
+    shutil.copy(_canonical_parquet_path, tmp_path / "forecasts.parquet")
 
+    return parquet_loader(tmp_path)
 
-def test_parse_month_range(service):
-    """Test month range parsing."""
 
-    months = service.parse_month_range("2024-01:2024-03")
-    assert months == ["2024-01", "2024-02", "2024-03"]
+@pytest.fixture(scope="module")
+def service(_canonical_parquet_path, tmp_path_factory):
+    """Read-only service shared by the tests that never touch the data files."""
+    data_path = tmp_path_factory.mktemp("service_data")
+    shutil.copy(_canonical_parquet_path, data_path / "forecasts.parquet")
+    return ForecastService(parquet_loader(data_path))
 
-    months = service.parse_month_range("2023-11:2024-02")
-    assert months == ["2023-11", "2023-12", "2024-01", "2024-02"]
 
-    months = service.parse_month_range("2024-06:2024-06")
-    assert months == ["2024-06"]
+@pytest.mark.parametrize(
+    ("month_range", "expected"),
+    [
+        ("2024-01:2024-03", ["2024-01", "2024-02", "2024-03"]),
+        ("2023-11:2024-02", ["2023-11", "2023-12", "2024-01", "2024-02"]),
+        ("2024-06:2024-06", ["2024-06"]),
+    ],
+)
+def test_parse_month_range(service, month_range, expected):
+    """Test month range parsing."""
+    assert service.parse_month_range(month_range) == expected
 
-    with pytest.raises(ValueError):
-        service.parse_month_range("2024-03:2024-01")
 
+@pytest.mark.parametrize(
+    "month_range",
+    [
+        "2024-03:2024-01",
+        "2024-01-2024-03",
+        "2024:2025",
+        "2024-01-15:2024-02",
+        "Jan 2024:2024-02",
+    ],
+)
+def test_parse_month_range_rejects_invalid_ranges(service, month_range):
     with pytest.raises(ValueError):
-        service.parse_month_range("2024-01-2024-03")
+        service.parse_month_range(month_range)
+
+
+@pytest.mark.parametrize("month_range", [":2024-01", "2024-01:"])
+def test_parse_month_range_rejects_empty_endpoints(service, month_range):
+    with pytest.raises(ValueError, match="Invalid month range format"):
+        service.parse_month_range(month_range)
 
 
 def test_get_forecasts(service):
     """Test getting forecasts."""
-    forecasts = service.get_forecasts(ForecastQuery())
+    forecasts = service.get_forecasts(make_query())
     assert isinstance(forecasts, list)
 
-    query = ForecastQuery(country="800")
+    query = make_query(country="800")
     forecasts = service.get_forecasts(query)
     for forecast in forecasts:
         assert forecast.country_id == "800"
 
-    query = ForecastQuery(month_range="2024-01:2024-02")
+    query = make_query(month_range="2024-01:2024-02")
     forecasts = service.get_forecasts(query)
     for forecast in forecasts:
         assert forecast.month in ["2024-01", "2024-02"]
 
-    query = ForecastQuery(metrics=[MetricName.map, MetricName.prob_10])
+    query = make_query(metrics=[MetricName.map, MetricName.prob_10])
     forecasts = service.get_forecasts(query)
     for forecast in forecasts:
         assert set(forecast.metrics.model_dump().keys()) == {"map", "prob_10"}
 
 
+def test_get_forecasts_returns_valid_models(service):
+    """Forecasts are built without validation; they must still pass it."""
+    forecasts = service.get_forecasts(make_query())
+
+    validated = FORECAST_LIST.validate_python(FORECAST_LIST.dump_python(forecasts))
+    assert validated == forecasts
+
+
+def test_repository_drops_rows_that_fail_validation(repository, tmp_path, caplog):
+    """Rows with out-of-range or non-finite metrics never reach the built models."""
+    df = FORECAST_TABLE.to_pandas()
+    bad = pd.concat([df.iloc[[0]]] * 3, ignore_index=True)
+    bad["grid_id"] = [10, 11, 12]
+    bad.loc[0, "prob_0"] = 3.0
+    bad.loc[1, "map"] = float("nan")
+    bad.loc[2, "ci_90_low"] = bad.loc[2, "ci_90_high"] + 1
+    bad.to_parquet(tmp_path / "bad.parquet", index=False)
+
+    with caplog.at_level("WARNING", logger="app.services.data_loader"):
+        forecasts = repository.get_forecasts()
+
+    assert sorted(forecast.grid_id for forecast in forecasts) == [1, 1, 2]
+    assert "Dropping 3 forecast rows" in caplog.text
+    assert FORECAST_LIST.validate_python(FORECAST_LIST.dump_python(forecasts)) == forecasts
+
+
 def test_get_forecast_summary(service):
     """Test forecast summary generation."""
-    forecasts = service.get_forecasts(ForecastQuery())
+    forecasts = service.get_forecasts(make_query())
     summary = service.get_forecast_summary(forecasts)
 
     assert "count" in summary
@@ -150,26 +283,129 @@ def test_get_forecast_summary(service):
         assert summary["grid_cells"] > 0
 
 
-def test_repository_generates_sample_data(monkeypatch, tmp_path):
+def test_get_summary_matches_list_summary(service):
+    """Frame-based summaries should agree with the model-based fallback."""
+    query = make_query(month_range="2024-01:2024-02")
+    expected = service.get_forecast_summary(service.get_forecasts(query))
+
+    assert service.get_summary(query) == expected
+    assert service.get_summary(make_query(country="108"))["count"] == 0
+
+
+class ListOnlyRepository:
+    """Repository without ``get_forecast_frame``, like a non-pandas backend."""
+
+    def __init__(self, repository):
+        self.get_forecasts = repository.get_forecasts
+
+
+def test_get_summary_falls_back_without_frame_support(service):
+    list_service = ForecastService(ListOnlyRepository(service.repository))
+    query = make_query(month_range="2024-01:2024-02")
+
+    assert list_service.get_summary(query) == service.get_summary(query)
+
+
+def test_repository_reloads_when_parquet_changes(repository, tmp_path):
+    """Cached data and query results are reused until the parquet files change."""
+    first = repository.get_forecasts()
+    assert repository._load_data() is repository._load_data()
+    assert repository.get_forecasts() is first
+
+    df = FORECAST_TABLE.to_pandas()
+    df[df["country_id"] == "800"].to_parquet(tmp_path / "forecasts.parquet", index=False)
+
+    second = repository.get_forecasts()
+    assert len(first) == 3
+    assert {forecast.country_id for forecast in second} == {"800"}
+
+
+def test_result_cache_bounds_cached_forecasts(_canonical_parquet_path, tmp_path, monkeypatch):
+    """Results larger than the cache budget are rebuilt; the dataset is checked once."""
+    monkeypatch.setattr(data_loader, "RESULT_CACHE_MAX_FORECASTS", 2)
+    shutil.copy(_canonical_parquet_path, tmp_path / "forecasts.parquet")
+    repository = parquet_loader(tmp_path)
+
+    loads = []
+    load_data = repository._load_data
+    monkeypatch.setattr(repository, "_load_data", lambda: loads.append(1) or load_data())
+
+    assert repository.get_forecasts() is not repository.get_forecasts()
+    first = repository.get_forecasts(country="074")
+    assert repository.get_forecasts(country="074") is first
+    assert len(loads) == 4
+
+
+def test_stream_forecasts_matches_get_forecasts(service):
+    """Streaming yields the same forecasts as the materialized list."""
+    query = make_query(month_range="2024-01:2024-02", metrics=[MetricName.map])
+    count, stream = service.stream_forecasts(query)
+    forecasts = service.get_forecasts(query)
+
+    assert count == len(forecasts) == 3
+    assert FORECAST_LIST.dump_python(list(stream)) == FORECAST_LIST.dump_python(forecasts)
+
+
+def test_forecast_frame_slices_match_mask_filters(sample_repository):
+    """Index-based slicing returns the same rows as boolean mask filtering."""
+    repository = sample_repository
+    full = repository.get_forecast_frame()
+
+    months = ["2025-09", "2025-11", "2031-01"]
+    for country in (None, "404", "999"):
+        result = repository.get_forecast_frame(country=country, months=months)
+        mask = full["month"].isin(months)
+        if country:
+            mask &= full["country_id"] == country
+        pd.testing.assert_frame_equal(result, full[mask])
+
+
+def test_repository_reads_parquet_files_with_diverging_schemas(repository, tmp_path):
+    """Files whose schemas cannot be unified are still combined."""
+    df = FORECAST_TABLE.slice(0, 1).to_pandas()
+    df["admin_1_id"] = None
+    df["admin_2_id"] = None
+    df.to_parquet(tmp_path / "extra.parquet", index=False)
+
+    forecasts = repository.get_forecasts(grid_ids=[1])
+    assert len(forecasts) == 3
+    assert sum(forecast.admin_1_id is None for forecast in forecasts) == 1
+
+
+def test_repository_generates_sample_data(sample_repository):
     """Repository should generate sample data when none exists."""
-    monkeypatch.setattr(settings, "data_path", str(tmp_path), raising=False)
+    assert (sample_repository.data_path / "sample_data.parquet").exists()
+    assert sample_repository.get_forecasts(), "Sample data should provide forecast rows"
+
+
+def test_cloud_backend_falls_back_without_credentials(tmp_path):
+    """Missing AWS credentials switch a cloud loader to local parquet data."""
+    loader_settings = settings.model_copy(
+        update={
+            "data_backend": "cloud",
+            "use_local_data": False,
+            "aws_access_key_id": "",
+            "aws_secret_access_key": "",
+            "data_path": str(tmp_path),
+        }
+    )
 
-    repository = DataLoader(data_path=str(tmp_path), backend="parquet")
-    forecasts = repository.get_forecasts()
+    repository = DataLoader(settings=loader_settings)
 
-    assert forecasts, "Sample data should provide forecast rows"
+    assert repository.backend == "parquet"
+    assert repository.data_path == tmp_path
     assert (tmp_path / "sample_data.parquet").exists()
 
 
 def test_metric_filters(service):
-    query = ForecastQuery(metric_filters=["map>50"], metrics=[MetricName.map])
+    query = make_query(metric_filters=["map>50"], metrics=[MetricName.map])
     forecasts = service.get_forecasts(query)
     assert len(forecasts) == 1
     assert forecasts[0].metrics.map > 50
 
-    query = ForecastQuery(metric_filters=["prob_1000>=0.1"])
+    query = make_query(metric_filters=["prob_1000>=0.1"])
     forecasts = service.get_forecasts(query)
     assert {f.grid_id for f in forecasts} == {1}
 
     with pytest.raises(ValueError):
-        service.get_forecasts(ForecastQuery(metric_filters=["map>>50"]))
+        service.get_forecasts(make_query(metric_filters=["map>>50"]))